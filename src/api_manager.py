@@ -7,6 +7,8 @@ import os
 import time
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional, Union
 from pathlib import Path
 import base64
@@ -20,6 +22,12 @@ load_dotenv()
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Connection pool size per host; covers concurrent batch requests
+HTTP_POOL_SIZE = 16
+
+# Chunk size for streaming image downloads
+DOWNLOAD_CHUNK_BYTES = 1 << 20
+
 
 class BriaAPIManager:
     """
@@ -65,6 +73,35 @@ class BriaAPIManager:
             "api_token": self.api_token,  # Bria uses 'api_token' header, not Bearer
             "Content-Type": "application/json"
         }
+        
+        self.session = self._create_session()
+    
+    def _create_session(self) -> requests.Session:
+        """
+        Create a pooled HTTP session shared by all API calls.
+        
+        Keeping connections alive avoids a TCP + TLS handshake per request.
+        Idempotent requests (status polls, downloads) are retried with backoff
+        on transient errors; POSTs are not, so a generation is never submitted twice.
+        
+        Returns:
+            Configured requests.Session
+        """
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504)
+        )
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=retry
+        )
+        
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
     
     def _encode_image_to_base64(self, image_path: Union[str, Path]) -> str:
         """
@@ -104,7 +141,7 @@ class BriaAPIManager:
                     f"Request ID: {request_id}"
                 )
             
-            response = requests.get(status_url, headers=self.headers)
+            response = self.session.get(status_url, headers=self.headers)
             response.raise_for_status()
             
             result = response.json()
@@ -143,7 +180,7 @@ class BriaAPIManager:
             "sync": sync
         }
         
-        response = requests.post(endpoint, headers=self.headers, json=payload)
+        response = self.session.post(endpoint, headers=self.headers, json=payload)
         response.raise_for_status()
         
         result = response.json()
@@ -184,7 +221,7 @@ class BriaAPIManager:
         if prompt:
             payload["prompt"] = prompt
         
-        response = requests.post(endpoint, headers=self.headers, json=payload)
+        response = self.session.post(endpoint, headers=self.headers, json=payload)
         response.raise_for_status()
         
         result = response.json()
@@ -254,7 +291,7 @@ class BriaAPIManager:
         
         logger.info(f"Sending request to {endpoint} with payload keys: {list(payload.keys())}")
         
-        response = requests.post(endpoint, headers=self.headers, json=payload)
+        response = self.session.post(endpoint, headers=self.headers, json=payload)
         
         # Better error handling for 422
         if response.status_code == 422:
@@ -317,7 +354,7 @@ class BriaAPIManager:
         if seed is not None:
             payload["seed"] = seed
         
-        response = requests.post(endpoint, headers=self.headers, json=payload)
+        response = self.session.post(endpoint, headers=self.headers, json=payload)
         response.raise_for_status()
         
         result = response.json()
@@ -359,7 +396,7 @@ class BriaAPIManager:
             "sync": sync
         }
         
-        response = requests.post(endpoint, headers=self.headers, json=payload)
+        response = self.session.post(endpoint, headers=self.headers, json=payload)
         response.raise_for_status()
         
         result = response.json()
@@ -385,18 +422,28 @@ class BriaAPIManager:
         Returns:
             PIL Image object
         """
-        response = requests.get(image_url)
-        response.raise_for_status()
-        
-        # If saving to file, write raw bytes to preserve C2PA metadata
-        if output_path:
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
-            # Then open the saved file
-            image = Image.open(output_path)
-        else:
-            # If not saving, just open from bytes
-            image = Image.open(BytesIO(response.content))
+        with self.session.get(image_url, stream=True) as response:
+            response.raise_for_status()
+            
+            # If saving to file, write raw bytes to preserve C2PA metadata
+            if output_path:
+                with open(output_path, 'wb') as f:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_BYTES):
+                        f.write(chunk)
+                # Then load the saved file, closing its handle straight away
+                with Image.open(output_path) as saved:
+                    saved.load()
+                    image = saved.copy()
+            else:
+                # If not saving, stream into one buffer instead of response.content + a copy
+                buffer = BytesIO()
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_BYTES):
+                    buffer.write(chunk)
+                buffer.seek(0)
+                image = Image.open(buffer)
+                # Decode now, on this (possibly worker) thread, rather than lazily
+                # on first pixel access; PIL's codecs release the GIL while decoding
+                image.load()
         
         return image
     
@@ -56,12 +56,13 @@ class StateManager:
         Returns:
             Path to saved state file
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         state_file = self.state_dir / f"state_{campaign_id}_{timestamp}.json"
         
         state_data = {
             "version": "1.0",
-            "saved_at": datetime.now().isoformat(),
+            "saved_at": now.isoformat(),
             "campaign_id": campaign_id,
             "master_json": master_json,
             "progress": {
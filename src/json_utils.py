@@ -0,0 +1,47 @@
+"""
+JSON helpers for Global Brand Localizer
+Uses orjson when it is installed and falls back to the stdlib json module
+"""
+
+import io
+import json
+from pathlib import Path
+from typing import Any, Union
+
+# Optional orjson for faster JSON parsing/serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON with orjson when available, else the stdlib json module."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes with orjson when available (2-space indent if requested)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+
+def json_dump_file(obj: Any, path: Union[str, Path], indent: bool = False):
+    """
+    Write JSON to a file without building an intermediate str.
+    
+    orjson serializes to bytes in one C-level pass (numpy arrays included);
+    the stdlib fallback streams encoder chunks straight to the file.
+    """
+    with open(path, 'wb') as f:
+        if ORJSON_AVAILABLE:
+            option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+            f.write(orjson.dumps(obj, option=option))
+        else:
+            with io.TextIOWrapper(f, encoding='utf-8') as text:
+                json.dump(obj, text, indent=2 if indent else None)
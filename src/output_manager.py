@@ -10,8 +10,9 @@ Handles:
 
 import logging
 import json
+import os
 import time
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Set, Tuple
 from pathlib import Path
 from datetime import datetime
 from PIL import Image
@@ -29,6 +30,9 @@ except ImportError:
     C2PA_AVAILABLE = False
     logger.warning("C2PA verifier not available - C2PA verification will be skipped")
 
+# TIFFs above this (uncompressed) size are dropped from the page cache once written
+LARGE_TIFF_THRESHOLD_BYTES = 50 * 1024 * 1024
+
 
 class OutputManager:
     """
@@ -57,6 +61,9 @@ class OutputManager:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.consistency_threshold = consistency_threshold
         
+        # Region directories already created by this instance (skips repeat mkdir syscalls)
+        self._known_dirs: Set[str] = set()
+        
         # Initialize C2PA verifier if available and enabled
         self.c2pa_verifier = None
         if enable_c2pa and C2PA_AVAILABLE:
@@ -161,6 +168,39 @@ class OutputManager:
             logger.warning("Using fallback center region mask")
             return fallback_mask
     
+    def _draft_master_image(self, master_image: Image.Image, target_size: Tuple[int, int]) -> Image.Image:
+        """
+        Re-decode a large JPEG master at reduced scale for comparison.
+        
+        libjpeg can decode directly at 1/2, 1/4 or 1/8 scale, which is much cheaper
+        than a full decode followed by a resize. Only applies when the master was
+        opened from a JPEG file and is at least 2x larger than the target.
+        
+        Args:
+            master_image: Original master product image
+            target_size: (width, height) the master will be compared at
+        
+        Returns:
+            Reduced-scale master image, or the original image if drafting does not apply
+        """
+        filename = getattr(master_image, "filename", None)
+        if not filename or master_image.format != "JPEG":
+            return master_image
+        
+        width, height = master_image.size
+        if width < target_size[0] * 2 or height < target_size[1] * 2:
+            return master_image
+        
+        try:
+            with Image.open(filename) as drafted:
+                drafted.draft('RGB', target_size)
+                drafted_rgb = drafted.convert('RGB')
+            logger.debug(f"Decoded master at reduced scale: {master_image.size} -> {drafted_rgb.size}")
+            return drafted_rgb
+        except Exception as e:
+            logger.debug(f"Draft decode failed, using full master: {e}")
+            return master_image
+    
     def calculate_consistency_score(
         self,
         generated_image: Image.Image,
@@ -187,6 +227,9 @@ class OutputManager:
             - heatmap_array: NumPy array representing pixel differences in product region
         """
         try:
+            # Large JPEG masters can be decoded at reduced scale by libjpeg
+            master_image = self._draft_master_image(master_image, generated_image.size)
+            
             # Convert images to numpy arrays
             gen_array = np.array(generated_image.convert('RGB'))
             master_array = np.array(master_image.convert('RGB'))
@@ -317,8 +360,11 @@ class OutputManager:
                         interpolation=cv2.INTER_LANCZOS4
                     )
                 
-                diff = np.abs(gen_array.astype(np.float32) - master_array.astype(np.float32))
-                diff_magnitude = np.sqrt(np.sum(diff ** 2, axis=2))
+                # int16 holds the full [-255, 255] range, so skip the float32 copies
+                # and only promote once for the final sqrt
+                diff = np.subtract(gen_array, master_array, dtype=np.int16)
+                squared_sum = np.square(diff, dtype=np.int32).sum(axis=2, dtype=np.int32)
+                diff_magnitude = np.sqrt(squared_sum, dtype=np.float32)
                 max_diff = np.sqrt(3 * (255 ** 2))
                 normalized_diff = diff_magnitude / max_diff
                 consistency_score = float(np.mean(normalized_diff))
@@ -346,6 +392,10 @@ class OutputManager:
             PIL Image with heatmap overlay
         """
         try:
+            # Fully transparent overlay - nothing to blend
+            if alpha <= 0:
+                return generated_image
+            
             # Convert generated image to numpy array
             gen_array = np.array(generated_image.convert('RGB'))
             
@@ -361,6 +411,10 @@ class OutputManager:
                     interpolation=cv2.INTER_LINEAR
                 )
             
+            # Fully opaque overlay - the heatmap replaces the image
+            if alpha >= 1:
+                return Image.fromarray(heatmap_colored)
+            
             # Blend images
             blended = cv2.addWeighted(
                 gen_array,
@@ -408,7 +462,10 @@ class OutputManager:
         
         # Create region-specific subdirectory
         region_dir = self.output_dir / region_id
-        region_dir.mkdir(parents=True, exist_ok=True)
+        region_key = str(region_dir)
+        if region_key not in self._known_dirs:
+            region_dir.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(region_key)
         
         # Generate timestamp-based filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -528,21 +585,56 @@ class OutputManager:
             # PIL doesn't support 16-bit RGB directly, so we save as 16-bit grayscale per channel
             # or use the original RGB and let TIFF handle it
             # For simplicity, save the original RGB as TIFF (TIFF supports 16-bit per channel)
-            image.save(
-                path,
-                format='TIFF',
-                compression='tiff_lzw'
-            )
+            self._write_tiff(image, path)
         else:
             # For other modes, save directly
-            image.save(
-                path,
-                format='TIFF',
-                compression='tiff_lzw'
-            )
+            self._write_tiff(image, path)
         
         logger.info(f"✓ Saved 16-bit TIFF: {path.name}")
     
+    def _write_tiff(self, image: Image.Image, path: Path) -> None:
+        """
+        Write image as LZW-compressed TIFF, keeping large files out of the page cache.
+        
+        Print-resolution TIFFs can reach 100+ MB. They are still streamed to
+        disk by Pillow (no in-memory copy of the encoded file); once written,
+        the kernel is advised to drop their cached pages so they don't evict
+        data the rest of the pipeline is using.
+        
+        Args:
+            image: PIL Image
+            path: Output file path
+        """
+        image.save(
+            path,
+            format='TIFF',
+            compression='tiff_lzw'
+        )
+        
+        estimated_size = image.width * image.height * len(image.getbands())
+        if estimated_size >= LARGE_TIFF_THRESHOLD_BYTES and hasattr(os, 'posix_fadvise'):
+            self._drop_from_page_cache(path)
+    
+    def _drop_from_page_cache(self, path: Path) -> None:
+        """
+        Advise the kernel to drop a written file's cached pages.
+        
+        Best effort and non-blocking: the file is not flushed first, so pages
+        still waiting for writeback stay cached until the kernel writes them
+        out on its own schedule.
+        
+        Args:
+            path: File to drop from the page cache
+        """
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.debug(f"Could not drop {path.name} from the page cache: {e}")
+    
     def _save_8bit_png(self, image: Image.Image, path: Path) -> None:
         """
         Save image as 8-bit PNG for web preview.
@@ -555,11 +647,12 @@ class OutputManager:
         if image.mode not in ('RGB', 'RGBA'):
             image = image.convert('RGB')
         
-        # Save as PNG with optimization
+        # Save as PNG with fast compression - the 16-bit TIFF is the archival
+        # output, so the slow optimize pass isn't worth it for a web preview
         image.save(
             path,
             format='PNG',
-            optimize=True
+            compress_level=1
         )
         
         logger.info(f"✓ Saved 8-bit PNG: {path.name}")
@@ -602,36 +695,45 @@ class OutputManager:
         Returns:
             Audit JSON dictionary
         """
+        metadata = region_json.get("metadata") or {}
+        
+        if consistency_score is None:
+            status = "not_checked"
+        elif consistency_score <= self.consistency_threshold:
+            status = "passed"
+        else:
+            status = "flagged"
+        
         audit_json = {
             "generation_info": {
                 "timestamp": datetime.now().isoformat(),
                 "seed": seed,
-                "region_id": region_json.get("metadata", {}).get("region_id"),
-                "region_name": region_json.get("metadata", {}).get("region_name"),
-                "locale": region_json.get("metadata", {}).get("locale")
+                "region_id": metadata.get("region_id"),
+                "region_name": metadata.get("region_name"),
+                "locale": metadata.get("locale")
             },
             "output_files": {
-                "tiff_16bit": str(tiff_path.name),
-                "png_8bit": str(png_path.name)
+                "tiff_16bit": tiff_path.name,
+                "png_8bit": png_path.name
             },
             "consistency_check": {
                 "score": consistency_score,
                 "threshold": self.consistency_threshold,
                 "flagged_for_review": flagged_for_review,
-                "status": "passed" if consistency_score is not None and consistency_score <= self.consistency_threshold else "flagged" if consistency_score is not None else "not_checked"
+                "status": status
             },
             "c2pa_credentials": c2pa_status if c2pa_status else {
                 "status": "not_verified",
                 "message": "C2PA verification not performed"
             },
             "master_json": {
-                "campaign_id": region_json.get("metadata", {}).get("campaign_id"),
-                "source_image": region_json.get("metadata", {}).get("source_image")
+                "campaign_id": metadata.get("campaign_id"),
+                "source_image": metadata.get("source_image")
             },
             "locked_parameters": region_json.get("locked_parameters", {}),
             "variable_parameters": region_json.get("variable_parameters", {}),
             "negative_prompts": region_json.get("negative_prompts", []),
-            "cultural_context": region_json.get("metadata", {}).get("cultural_context", {})
+            "cultural_context": metadata.get("cultural_context", {})
         }
         
         return audit_json
@@ -690,19 +792,21 @@ class OutputManager:
             Tuple of (is_consistent, details_dict)
         """
         try:
-            # Load both images
-            tiff_img = Image.open(tiff_path)
-            png_img = Image.open(png_path)
+            # Only the headers are needed; close both files right away
+            with Image.open(tiff_path) as tiff_img:
+                tiff_size = tiff_img.size
+            with Image.open(png_path) as png_img:
+                png_size = png_img.size
             
             # Check aspect ratio
-            tiff_aspect = tiff_img.size[0] / tiff_img.size[1]
-            png_aspect = png_img.size[0] / png_img.size[1]
+            tiff_aspect = tiff_size[0] / tiff_size[1]
+            png_aspect = png_size[0] / png_size[1]
             aspect_ratio_match = abs(tiff_aspect - png_aspect) < 0.01
             
             # Check dimensions (PNG should be same or smaller)
             size_match = (
-                png_img.size[0] <= tiff_img.size[0] and
-                png_img.size[1] <= tiff_img.size[1]
+                png_size[0] <= tiff_size[0] and
+                png_size[1] <= tiff_size[1]
             )
             
             # Check format
@@ -719,8 +823,8 @@ class OutputManager:
             details = {
                 "aspect_ratio_match": aspect_ratio_match,
                 "size_match": size_match,
-                "tiff_size": tiff_img.size,
-                "png_size": png_img.size,
+                "tiff_size": tiff_size,
+                "png_size": png_size,
                 "tiff_format_ok": tiff_format_ok,
                 "png_format_ok": png_format_ok
             }
@@ -8,29 +8,171 @@ Manages the dual-pipeline architecture:
 Handles initialization, error handling, and fallback to Cloud API.
 """
 
+import copy
+import hashlib
+import importlib
+import importlib.util
+import itertools
 import logging
 import json
-from typing import Dict, Any, Optional, Union
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Set, Tuple, Union
 from pathlib import Path
 from datetime import datetime
 from PIL import Image
 
 # Import API Manager and Schema Sanitizer
 from src.api_manager import BriaAPIManager
+from src.json_utils import json_dump_file, json_dumps, json_loads
 from src.schema_sanitizer import SchemaSanitizer
 
-# Optional torch import for local GPU support
-try:
-    import torch
-    TORCH_AVAILABLE = True
-except ImportError:
-    TORCH_AVAILABLE = False
-    torch = None
+
+class _LazyModule:
+    """Module proxy that performs the real import on first attribute access."""
+    
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+# Optional torch import for local GPU support. torch is only imported once a
+# local code path touches it, so Cloud API-only use doesn't pay for loading it.
+TORCH_AVAILABLE = importlib.util.find_spec("torch") is not None
+torch = _LazyModule("torch") if TORCH_AVAILABLE else None
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
+_MISSING = object()
+
+
+# Process-local sequence number that keeps campaign IDs unique within a nanosecond
+_CAMPAIGN_COUNTER = itertools.count()
+
+
+def _new_campaign_id() -> str:
+    """Return a unique campaign ID (created_at in the metadata stays human-readable)."""
+    return f"campaign_{time.time_ns()}_{next(_CAMPAIGN_COUNTER)}"
+
+
+def _lookup(mapping: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    """Resolve a nested key path, returning _MISSING if any key is absent."""
+    for key in path:
+        if not isinstance(mapping, dict) or key not in mapping:
+            return _MISSING
+        mapping = mapping[key]
+    return mapping
+
+
+# Content-addressed image → JSON cache: in-memory LRU plus on-disk copies
+VLM_CACHE_SIZE = 256
+VLM_CACHE_DIR = Path.home() / ".cache" / "fibo" / "vlm"
+# Bump when the VLM prompt or Master JSON layout changes, to retire cached entries
+VLM_CACHE_VERSION = 1
+
+# Concurrent requests when batching work over the Cloud API
+CLOUD_BATCH_WORKERS = 8
+
+# Variable-parameter fields rendered into text prompts: (key path, label)
+_PROMPT_FIELDS = (
+    (("background_setting",), "Background"),
+    (("lighting", "conditions"), "Lighting"),
+    (("aesthetics", "mood_atmosphere"), "Mood"),
+)
+
+# Weight-only quantization modes for the FIBO transformer (optimum-quanto)
+QUANTIZATION_MODES = ("int8", "fp8", "int4")
+
+# GPUs with less total memory than this run FIBO with model CPU offload
+LOW_VRAM_BYTES = 8 * 1024 ** 3
+
+# Below this much free VRAM, fall back to attention slicing when neither SDPA
+# nor xFormers is available
+ATTENTION_SLICING_FREE_BYTES = 8 * 1024 ** 3
+
+# Default JSON templates, deep-copied per call instead of rebuilt as literals
+_DEFAULT_VLM_JSON_TEMPLATE: Dict[str, Any] = {
+    "version": "1.0",
+    "metadata": {
+        "source": "vlm_analysis",
+        "model": "briaai/FIBO-VLM-prompt-to-JSON"
+    },
+    "locked_parameters": {
+        "camera_angle": "eye_level",  # Will be extracted from VLM
+        "focal_length": 50,
+        "aspect_ratio": "1:1",
+        "product_geometry": {
+            "position": [0.5, 0.5],
+            "scale": 1.0,
+            "rotation": 0
+        }
+    },
+    "variable_parameters": {
+        "background": "neutral",
+        "lighting_type": "soft_natural",
+        "environment": "studio",
+        "mood": "professional"
+    }
+}
+
+_DEFAULT_STRUCTURED_PROMPT: Dict[str, Any] = {
+    "short_description": "Professional product photo",
+    "photographic_characteristics": {
+        "camera_angle": "eye_level",
+        "lens_focal_length": "50mm",
+        "depth_of_field": "shallow",
+        "focus": "sharp focus on subject"
+    },
+    "lighting": {
+        "conditions": "soft_natural",
+        "direction": "front lighting",
+        "shadows": "soft shadows"
+    },
+    "style_medium": "photograph",
+    "background_setting": "neutral studio background",
+    "aesthetics": {
+        "composition": "centered",
+        "color_scheme": "neutral tones",
+        "mood_atmosphere": "professional"
+    }
+}
+
+_DEFAULT_MASTER_JSON_TEMPLATE: Dict[str, Any] = {
+    "locked_parameters": {
+        "photographic_characteristics": {
+            "camera_angle": "eye_level",
+            "lens_focal_length": "50mm",
+            "depth_of_field": "shallow",
+            "focus": "sharp focus on subject"
+        },
+        "composition": "centered"
+    },
+    "variable_parameters": {
+        "background_setting": "neutral studio background",
+        "lighting": {
+            "conditions": "soft_natural",
+            "direction": "front lighting",
+            "shadows": "soft shadows"
+        },
+        "aesthetics": {
+            "color_scheme": "neutral tones",
+            "mood_atmosphere": "professional"
+        }
+    }
+}
+
+
 class FiboPipelineManager:
     """
     Manages FIBO pipelines with automatic fallback to Cloud API.
@@ -41,18 +183,86 @@ class FiboPipelineManager:
         use_cloud_api: Flag indicating if Cloud API fallback is active
     """
     
-    def __init__(self, use_local: bool = False, device: Optional[str] = None):
+    def __init__(
+        self,
+        use_local: bool = False,
+        device: Optional[str] = None,
+        cache_config: Optional[Any] = None,
+        cpu_offload_vlm: bool = True,
+        quantization: Optional[str] = None,
+        device_map: Optional[str] = None,
+        max_memory: Optional[Dict[Union[int, str], str]] = None,
+        vlm_cache: bool = True,
+        vlm_cache_dir: Optional[Union[str, Path]] = VLM_CACHE_DIR,
+        warmup: bool = False
+    ):
         """
         Initialize FIBO pipelines.
         
         Args:
             use_local: Whether to attempt local GPU initialization (default: False, use Cloud API)
             device: Specific device to use ('cuda', 'cpu', or None for auto-detect)
+            cache_config: Optional diffusers cache config for the FIBO transformer
+                          (e.g. PyramidAttentionBroadcastConfig), or True for
+                          FirstBlockCacheConfig(threshold=0.08). Caching reuses
+                          residuals across steps and is lossy, so it is off by
+                          default (None).
+            cpu_offload_vlm: Move the VLM to pinned CPU memory between image_to_json
+                             calls so FIBO generation gets its VRAM (CUDA only)
+            quantization: Optional weight-only quantization of the FIBO transformer
+                          ('int8', 'fp8' or 'int4'); requires optimum-quanto
+            device_map: Optional FIBO device map (e.g. 'balanced' to pool several
+                        GPUs). Defaults to 'balanced' with multiple GPUs, else the device
+            max_memory: Optional per-device memory caps for device_map,
+                        e.g. {0: "10GiB", 1: "10GiB", "cpu": "30GiB"}
+            vlm_cache: Reuse image → JSON results for identical images (default: True)
+            vlm_cache_dir: Directory for cache entries shared across processes,
+                           or None to keep the cache in memory only
+            warmup: With use_local, load both pipelines and warm up FIBO now
+                    (see preload_pipelines) instead of on first use
+        
+        Raises:
+            ValueError: If quantization is not a supported mode
         """
-        self.vlm_pipeline = None
-        self.fibo_pipeline = None
+        if quantization is not None and quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unsupported quantization '{quantization}', expected one of {QUANTIZATION_MODES}")
+        
+        # Pipelines are loaded lazily on first access (see vlm_pipeline / fibo_pipeline)
+        self._vlm_pipeline = None
+        self._fibo_pipeline = None
+        self._vlm_loader: Optional[Callable[[], Any]] = None
+        self._fibo_loader: Optional[Callable[[], Any]] = None
+        # Held while a pipeline loads, so concurrent callers wait for it
+        self._vlm_load_lock = threading.Lock()
+        self._fibo_load_lock = threading.Lock()
+        # Per-thread RNG, re-seeded for each generation instead of rebuilt
+        self._generator_cache = threading.local()
+        # (batch size, steps, guidance) combinations already captured as CUDA graphs
+        self._graph_keys: Set[Tuple[int, int, float]] = set()
         self.use_cloud_api = not use_local  # Default to Cloud API
-        self.device = device or self._detect_device()
+        # CUDA is probed once, on first need; get_status may be polled frequently
+        self._cuda_available: Optional[bool] = None
+        # The Cloud API never touches the device, so don't import torch to detect it
+        self.device = device or (self._detect_device() if use_local else 'cpu')
+        self.cache_config = cache_config
+        self.cpu_offload_vlm = cpu_offload_vlm
+        self.quantization = quantization
+        self.device_map = device_map
+        self.max_memory = max_memory
+        # Set when FIBO runs with model CPU offload on a small GPU
+        self._fibo_cpu_offload = False
+        # Image → JSON results keyed on image content + prompt (see image_to_json)
+        self._vlm_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._vlm_cache_lock = threading.Lock()
+        # VLM offload state: pinned host buffers reused by every offload, and
+        # the number of callers currently needing the VLM on the GPU
+        self._vlm_host_tensors: Optional[List[Any]] = None
+        self._vlm_users = 0
+        self._vlm_residency_lock = threading.Lock()
+        self.vlm_cache = vlm_cache
+        self.vlm_cache_dir = Path(vlm_cache_dir) if vlm_cache_dir is not None else None
+        # Weight dtype of the local pipelines, chosen in _initialize_local_pipelines
+        self.dtype = None
         
         # Initialize API Manager and Schema Sanitizer
         self.api_manager = BriaAPIManager()
@@ -68,6 +278,9 @@ class FiboPipelineManager:
                 logger.error(f"Local pipeline initialization failed: {e}")
                 logger.info("Will fallback to Cloud API when needed")
                 self.use_cloud_api = True
+            else:
+                if warmup:
+                    self.preload_pipelines()
         else:
             logger.info("Using Cloud API for all operations")
             self.use_cloud_api = True
@@ -83,7 +296,7 @@ class FiboPipelineManager:
             logger.info("PyTorch not available, will use Cloud API")
             return 'cpu'
         
-        if torch.cuda.is_available():
+        if self._is_cuda_available():
             device = 'cuda'
             gpu_name = torch.cuda.get_device_name(0)
             gpu_memory = torch.cuda.get_device_properties(0).total_memory / 1e9
@@ -94,9 +307,81 @@ class FiboPipelineManager:
         
         return device
     
+    def _is_cuda_available(self) -> bool:
+        """
+        Check for a usable CUDA device, probing the driver only once.
+        
+        Returns:
+            True if PyTorch is installed and CUDA is available
+        """
+        if self._cuda_available is None:
+            self._cuda_available = TORCH_AVAILABLE and torch.cuda.is_available()
+        return self._cuda_available
+    
+    def _pick_dtype(self) -> "torch.dtype":
+        """
+        Pick the weight dtype for the local FIBO pipeline.
+        
+        bfloat16 on Ampere and newer (same footprint as fp16, but without the
+        overflow issues), float16 on older CUDA GPUs. bfloat16 on CPU too: it
+        halves RAM and memory traffic, and recent x86/ARM CPUs have native
+        bf16 matmul instructions.
+        
+        Returns:
+            torch dtype to load the pipeline with
+        """
+        if self.device != 'cuda':
+            return torch.bfloat16
+        
+        if torch.cuda.get_device_capability() >= (8, 0):
+            return torch.bfloat16
+        return torch.float16
+    
+    def _sdpa_available(self) -> bool:
+        """
+        Check whether PyTorch provides scaled_dot_product_attention (PyTorch 2+).
+        
+        Returns:
+            True if SDPA attention kernels are available
+        """
+        return hasattr(torch.nn.functional, 'scaled_dot_product_attention')
+    
+    def _attention_context(self):
+        """
+        Context manager restricting SDPA to the Flash and memory-efficient kernels.
+        
+        Returns:
+            sdpa_kernel context on CUDA with PyTorch 2.3+, otherwise a no-op context
+        """
+        if self.device != 'cuda':
+            return nullcontext()
+        
+        try:
+            from torch.nn.attention import sdpa_kernel, SDPBackend
+        except ImportError:
+            return nullcontext()
+        
+        return sdpa_kernel([SDPBackend.FLASH_ATTENTION, SDPBackend.EFFICIENT_ATTENTION])
+    
+    def _autocast_context(self):
+        """
+        Context manager running CPU inference under bfloat16 autocast.
+        
+        Returns:
+            torch.autocast context on CPU, otherwise a no-op context
+        """
+        if self.device == 'cuda':
+            return nullcontext()
+        
+        return torch.autocast('cpu', dtype=self.dtype or torch.bfloat16)
+    
     def _initialize_local_pipelines(self):
         """
-        Initialize both FIBO pipelines locally.
+        Prepare both FIBO pipelines for local use.
+        
+        Checks that the local dependencies import and registers loaders for
+        the VLM and FIBO pipelines; the weights themselves are loaded on first
+        access of vlm_pipeline / fibo_pipeline (or via preload_pipelines).
         
         Raises:
             Exception: If pipeline loading fails
@@ -106,40 +391,23 @@ class FiboPipelineManager:
             from diffusers import BriaFiboPipeline
             from transformers import pipeline as hf_pipeline
             
-            logger.info("Loading VLM Bridge Pipeline (briaai/FIBO-VLM-prompt-to-JSON)...")
-            # Note: Using transformers pipeline for VLM
-            # The actual model name might need adjustment based on Bria's release
-            try:
-                self.vlm_pipeline = hf_pipeline(
-                    "image-to-text",
-                    model="briaai/FIBO-VLM-prompt-to-JSON",
-                    device=self.device
-                )
-                logger.info("✓ VLM Bridge Pipeline loaded successfully")
-            except Exception as e:
-                logger.warning(f"VLM Pipeline loading failed: {e}")
-                logger.info("Will use alternative VLM approach or Cloud API")
-            
-            logger.info("Loading FIBO Generation Pipeline (briaai/FIBO)...")
-            self.fibo_pipeline = BriaFiboPipeline.from_pretrained(
-                "briaai/FIBO",
-                torch_dtype=torch.float16 if self.device == 'cuda' else torch.float32,
-                use_safetensors=True
-            )
+            self.dtype = self._pick_dtype()
             
             if self.device == 'cuda':
-                self.fibo_pipeline = self.fibo_pipeline.to(self.device)
-                # Enable memory optimizations
-                self.fibo_pipeline.enable_attention_slicing()
-                if hasattr(self.fibo_pipeline, 'enable_xformers_memory_efficient_attention'):
-                    try:
-                        self.fibo_pipeline.enable_xformers_memory_efficient_attention()
-                        logger.info("✓ xFormers memory optimization enabled")
-                    except Exception:
-                        logger.info("xFormers not available, using standard attention")
+                # TF32 matmuls and cuDNN autotuning for the fixed generation shapes
+                torch.backends.cuda.matmul.allow_tf32 = True
+                torch.backends.cudnn.benchmark = True
+                # Lets Inductor pick TF32 kernels for any fp32 ops left in the compiled graph
+                torch.set_float32_matmul_precision("high")
+            else:
+                torch.set_num_threads(os.cpu_count() or 1)
+            
+            # Defer the actual model loads until a pipeline is first used, so
+            # single-path workflows never put the other model in memory
+            self._vlm_loader = lambda: self._load_on_side_stream(self._load_vlm_pipeline, hf_pipeline)
+            self._fibo_loader = lambda: self._load_on_side_stream(self._load_fibo_pipeline, BriaFiboPipeline)
             
-            logger.info("✓ FIBO Generation Pipeline loaded successfully")
-            logger.info("✓ All pipelines initialized successfully")
+            logger.info("✓ Local pipelines registered (loaded on first use)")
             
         except ImportError as e:
             logger.error(f"Missing required dependencies: {e}")
@@ -149,10 +417,441 @@ class FiboPipelineManager:
             logger.error(f"Pipeline initialization failed: {e}")
             raise
     
+    @property
+    def use_cloud_api(self) -> bool:
+        """Whether requests go to the Cloud API instead of the local pipelines."""
+        return self._use_cloud_api
+    
+    @use_cloud_api.setter
+    def use_cloud_api(self, value: bool):
+        # Bind the backend once here rather than branching on every call
+        self._use_cloud_api = value
+        if value:
+            self._image_to_json_impl = self._image_to_json_cloud
+            self._generate_images_impl = self._generate_images_cloud
+        else:
+            self._image_to_json_impl = self._image_to_json_local
+            self._generate_images_impl = self._generate_images_local
+    
+    @property
+    def vlm_pipeline(self) -> Optional[Any]:
+        """VLM Bridge pipeline, loaded on first access when running locally."""
+        if self._vlm_pipeline is None and self._vlm_loader is not None:
+            with self._vlm_load_lock:
+                if self._vlm_pipeline is None and self._vlm_loader is not None:
+                    try:
+                        self._vlm_pipeline = self._vlm_loader()
+                    finally:
+                        self._vlm_loader = None
+        return self._vlm_pipeline
+    
+    @vlm_pipeline.setter
+    def vlm_pipeline(self, pipeline: Optional[Any]):
+        self._vlm_pipeline = pipeline
+    
+    @property
+    def fibo_pipeline(self) -> Optional[Any]:
+        """FIBO Generation pipeline, loaded on first access when running locally."""
+        if self._fibo_pipeline is None and self._fibo_loader is not None:
+            with self._fibo_load_lock:
+                if self._fibo_pipeline is None and self._fibo_loader is not None:
+                    try:
+                        self._fibo_pipeline = self._fibo_loader()
+                    except Exception as e:
+                        logger.error(f"FIBO pipeline loading failed: {e}")
+                        logger.info("Falling back to Cloud API for image generation")
+                        self.use_cloud_api = True
+                    finally:
+                        self._fibo_loader = None
+        return self._fibo_pipeline
+    
+    @fibo_pipeline.setter
+    def fibo_pipeline(self, pipeline: Optional[Any]):
+        self._fibo_pipeline = pipeline
+    
+    def preload_pipelines(self):
+        """
+        Load both local pipelines now instead of on first use.
+        
+        Useful when a workflow needs both models (image → JSON → image). The
+        two loads run concurrently so their weight uploads overlap. On CUDA the
+        FIBO pipeline is also warmed up here; a lazy load on first use skips
+        the warmup so it doesn't add a throwaway generation to that call.
+        """
+        fibo_loading = self._fibo_pipeline is None and self._fibo_loader is not None
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            vlm_future = executor.submit(lambda: self.vlm_pipeline)
+            fibo_future = executor.submit(lambda: self.fibo_pipeline)
+            vlm_future.result()
+            fibo_future.result()
+        
+        if fibo_loading and self._fibo_pipeline is not None and self.device == 'cuda':
+            self._warmup_pipeline(self._fibo_pipeline)
+    
+    def _load_on_side_stream(self, loader: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a pipeline loader on its own CUDA stream.
+        
+        Lets the host-to-device copies of the VLM and FIBO weights proceed
+        concurrently (see preload_pipelines) instead of serializing on the
+        default stream. The side stream is synchronized before returning.
+        
+        Args:
+            loader: Loader method to call
+            *args: Arguments for the loader
+        
+        Returns:
+            Whatever the loader returns
+        """
+        if self.device != 'cuda':
+            return loader(*args)
+        
+        stream = torch.cuda.Stream()
+        with torch.cuda.stream(stream):
+            result = loader(*args)
+        stream.synchronize()
+        return result
+    
+    def _load_vlm_pipeline(self, hf_pipeline: Callable[..., Any]) -> Optional[Any]:
+        """
+        Load the VLM Bridge pipeline (briaai/FIBO-VLM-prompt-to-JSON).
+        
+        Args:
+            hf_pipeline: transformers.pipeline factory
+        
+        Returns:
+            Loaded pipeline, or None if loading failed (Cloud API is used instead)
+        """
+        logger.info("Loading VLM Bridge Pipeline (briaai/FIBO-VLM-prompt-to-JSON)...")
+        # Note: Using transformers pipeline for VLM
+        # The actual model name might need adjustment based on Bria's release
+        try:
+            quantization_config = self._vlm_quantization_config()
+            if quantization_config is not None:
+                # 8-bit weights are placed by accelerate and can't be moved with device=
+                vlm_pipeline = hf_pipeline(
+                    "image-to-text",
+                    model="briaai/FIBO-VLM-prompt-to-JSON",
+                    device_map=self.device,
+                    model_kwargs={"quantization_config": quantization_config}
+                )
+            else:
+                vlm_pipeline = hf_pipeline(
+                    "image-to-text",
+                    model="briaai/FIBO-VLM-prompt-to-JSON",
+                    device=self.device
+                )
+            logger.info("✓ VLM Bridge Pipeline loaded successfully")
+            return vlm_pipeline
+        except Exception as e:
+            logger.warning(f"VLM Pipeline loading failed: {e}")
+            logger.info("Will use alternative VLM approach or Cloud API")
+            return None
+    
+    def _vlm_quantization_config(self) -> Optional[Any]:
+        """
+        Build an int8 weight quantization config for the VLM, if supported.
+        
+        The VLM only runs a short image-understanding pass, so int8 weights
+        are an acceptable trade for half the weight memory and bandwidth of
+        fp16. bitsandbytes int8 kernels are CUDA-only.
+        
+        Returns:
+            BitsAndBytesConfig on CUDA with bitsandbytes installed, else None
+        """
+        if self.device != 'cuda':
+            return None
+        
+        try:
+            import bitsandbytes  # noqa: F401
+            from transformers import BitsAndBytesConfig
+        except ImportError:
+            logger.info("bitsandbytes not available, loading VLM unquantized")
+            return None
+        
+        return BitsAndBytesConfig(load_in_8bit=True)
+    
+    def _load_fibo_pipeline(self, pipeline_cls: Any) -> Any:
+        """
+        Load the FIBO pipeline, streaming weights directly onto the GPU when possible.
+        
+        Loading to CPU and then calling .to('cuda') holds a full copy of the
+        weights in host RAM and copies them in a separate serial phase. With
+        low_cpu_mem_usage and a device_map, shards are placed on the GPU as
+        they are read. On diffusers versions that don't accept a device string
+        as device_map, the weights are loaded to CPU and then uploaded tensor
+        by tensor from pinned memory (see _upload_pinned). With more than one
+        GPU the weights are balanced across them. GPUs with less than 8GB load
+        to CPU and use model CPU offload, keeping one component on the GPU at
+        a time.
+        
+        Args:
+            pipeline_cls: Pipeline class to load (BriaFiboPipeline)
+        
+        Returns:
+            Loaded pipeline on self.device
+        """
+        logger.info("Loading FIBO Generation Pipeline (briaai/FIBO)...")
+        load_kwargs = {
+            "torch_dtype": self.dtype,
+            "use_safetensors": True,
+            "low_cpu_mem_usage": True
+        }
+        
+        pipeline = None
+        if self.device == 'cuda':
+            self._fibo_cpu_offload = torch.cuda.get_device_properties(0).total_memory < LOW_VRAM_BYTES
+        
+        if self.device == 'cuda' and not self._fibo_cpu_offload:
+            device_map = self.device_map or ("balanced" if torch.cuda.device_count() > 1 else self.device)
+            if self.max_memory:
+                load_kwargs["max_memory"] = self.max_memory
+            try:
+                pipeline = pipeline_cls.from_pretrained("briaai/FIBO", device_map=device_map, **load_kwargs)
+            except (ValueError, NotImplementedError) as e:
+                logger.info(f"Direct-to-GPU loading not supported ({e}), loading via CPU")
+                load_kwargs.pop("max_memory", None)
+        
+        if pipeline is None:
+            pipeline = pipeline_cls.from_pretrained("briaai/FIBO", **load_kwargs)
+            if self._fibo_cpu_offload:
+                pipeline.enable_model_cpu_offload()
+                logger.info("✓ Model CPU offload enabled (GPU has less than 8GB)")
+            elif self.device == 'cuda':
+                self._upload_pinned(pipeline)
+        
+        self._configure_fibo_pipeline(pipeline)
+        logger.info("✓ FIBO Generation Pipeline loaded successfully")
+        return pipeline
+    
+    def _upload_pinned(self, pipeline: Any):
+        """
+        Move a CPU-loaded pipeline to the GPU with asynchronous pinned copies.
+        
+        Each parameter and buffer is pinned and copied with non_blocking=True on
+        the current stream, so the copies queue up instead of blocking Python
+        one by one. Meant to run under _load_on_side_stream, which synchronizes
+        the stream before the pipeline is used.
+        
+        Args:
+            pipeline: Pipeline loaded on CPU
+        """
+        for component in pipeline.components.values():
+            if not isinstance(component, torch.nn.Module):
+                continue
+            for tensor in list(component.parameters()) + list(component.buffers()):
+                tensor.data = tensor.data.pin_memory().to(self.device, non_blocking=True)
+    
+    def _configure_fibo_pipeline(self, pipeline: Any):
+        """
+        Apply attention and caching optimizations to a freshly loaded FIBO pipeline.
+        
+        Args:
+            pipeline: Loaded FIBO pipeline
+        """
+        if self.device == 'cuda':
+            # On PyTorch 2 the FIBO attention processors already run through
+            # scaled_dot_product_attention (Flash / memory-efficient kernels),
+            # which is faster than attention slicing. xFormers is only needed on 1.x,
+            # and only where it actually beats the default attention.
+            if not self._sdpa_available():
+                efficient_attention = False
+                if self._xformers_beneficial(pipeline):
+                    try:
+                        pipeline.enable_xformers_memory_efficient_attention()
+                        efficient_attention = True
+                        logger.info("✓ xFormers memory optimization enabled")
+                    except Exception:
+                        logger.info("xFormers not available, using standard attention")
+                
+                # Slicing is slower; only worth it when plain attention may not fit
+                free_memory, _ = torch.cuda.mem_get_info()
+                if not efficient_attention and free_memory < ATTENTION_SLICING_FREE_BYTES and hasattr(pipeline, 'enable_attention_slicing'):
+                    pipeline.enable_attention_slicing()
+                    logger.info(f"✓ Attention slicing enabled ({free_memory / 1e9:.1f}GB free)")
+            
+            # NHWC layout lets cuDNN pick its faster Tensor Core conv kernels.
+            # Only the convolutional parts benefit; the transformer is all linear layers.
+            for name in ('unet', 'vae'):
+                module = getattr(pipeline, name, None)
+                if module is not None:
+                    module.to(memory_format=torch.channels_last)
+        
+        if self.quantization:
+            self._quantize_transformer(pipeline)
+        
+        self._enable_transformer_cache(pipeline)
+        
+        if self.device == 'cuda':
+            # Offload hooks move modules between devices every call; not graph-safe
+            if not self._fibo_cpu_offload:
+                self._compile_transformer(pipeline)
+    
+    def _quantize_transformer(self, pipeline: Any):
+        """
+        Quantize the FIBO transformer weights with optimum-quanto.
+        
+        Only the transformer is quantized; it holds most of the weights and its
+        linear layers are bandwidth-bound. The text encoder and VAE keep the
+        pipeline dtype. fp8 needs Ada/Hopper (SM 8.9+) and falls back to int8.
+        
+        Args:
+            pipeline: Loaded FIBO pipeline
+        """
+        transformer = getattr(pipeline, 'transformer', None)
+        if transformer is None:
+            return
+        
+        try:
+            from optimum.quanto import quantize, freeze, qint8, qint4, qfloat8
+        except ImportError:
+            logger.warning("optimum-quanto not installed, skipping transformer quantization")
+            return
+        
+        mode = self.quantization
+        if mode == "fp8" and (self.device != 'cuda' or torch.cuda.get_device_capability() < (8, 9)):
+            logger.info("fp8 needs SM 8.9+, quantizing transformer to int8 instead")
+            mode = "int8"
+        
+        weights = {"int8": qint8, "fp8": qfloat8, "int4": qint4}[mode]
+        try:
+            quantize(transformer, weights=weights)
+            freeze(transformer)
+            logger.info(f"✓ FIBO transformer quantized ({mode} weights)")
+        except Exception as e:
+            logger.warning(f"Transformer quantization failed, keeping {self.dtype} weights: {e}")
+    
+    def _xformers_beneficial(self, pipeline: Any) -> bool:
+        """
+        Check whether xFormers memory-efficient attention is worth enabling.
+        
+        It gives no speedup (and can be slower) with fp32 weights, and on
+        V100-class GPUs it collapses to the same kernels PyTorch already uses.
+        
+        Args:
+            pipeline: Loaded FIBO pipeline
+        
+        Returns:
+            True if the pipeline supports xFormers and is likely to benefit
+        """
+        if not hasattr(pipeline, 'enable_xformers_memory_efficient_attention'):
+            return False
+        
+        if getattr(pipeline, 'dtype', None) not in (torch.float16, torch.bfloat16):
+            return False
+        
+        return torch.cuda.get_device_capability()[0] >= 8 or 'V100' not in torch.cuda.get_device_name(0)
+    
+    def _compile_transformer(self, pipeline: Any):
+        """
+        Wrap the FIBO transformer with torch.compile.
+        
+        reduce-overhead mode fuses the many small pointwise kernels launched per
+        denoising step and replays them through CUDA graphs. Compilation itself
+        happens lazily on the first forward: in _warmup_pipeline when the
+        pipelines are preloaded, otherwise in the first generation.
+        
+        Args:
+            pipeline: Loaded FIBO pipeline
+        """
+        transformer = getattr(pipeline, 'transformer', None)
+        if transformer is None or not hasattr(torch, 'compile'):
+            return
+        
+        try:
+            pipeline.transformer = torch.compile(
+                transformer,
+                mode="reduce-overhead",
+                fullgraph=False,
+                dynamic=False
+            )
+        except Exception as e:
+            logger.info(f"torch.compile not available, running eager: {e}")
+    
+    def _warmup_pipeline(self, pipeline: Any):
+        """
+        Run a short throwaway generation to pay one-time GPU costs up front.
+        
+        cuDNN autotuning, kernel selection and torch.compile code generation
+        all happen on the first forward pass; doing it in preload_pipelines
+        keeps them out of the first real generate_image call. If the compiled transformer fails,
+        the eager one is restored and warmed up instead. Failures are logged
+        and otherwise ignored.
+        
+        Args:
+            pipeline: Loaded FIBO pipeline
+        """
+        def run_warmup():
+            with torch.inference_mode(), self._attention_context():
+                pipeline(
+                    prompt=self._get_default_structured_prompt(),
+                    num_inference_steps=2,
+                    guidance_scale=7.5,  # generate_image default, so the CFG batch shape is captured
+                    generator=self._get_generator(0)
+                )
+        
+        compiled = hasattr(getattr(pipeline, 'transformer', None), '_orig_mod')
+        try:
+            run_warmup()
+            if compiled:
+                logger.info("✓ FIBO transformer compiled (torch.compile, reduce-overhead)")
+            logger.info("✓ FIBO pipeline warmed up")
+            return
+        except Exception as e:
+            if not compiled:
+                logger.warning(f"FIBO warmup failed: {e}")
+                return
+            logger.info(f"torch.compile failed, running eager: {e}")
+            pipeline.transformer = pipeline.transformer._orig_mod
+        
+        try:
+            run_warmup()
+            logger.info("✓ FIBO pipeline warmed up")
+        except Exception as e:
+            logger.warning(f"FIBO warmup failed: {e}")
+    
+    def _enable_transformer_cache(self, pipeline: Any):
+        """
+        Enable timestep caching on the FIBO transformer, if cache_config is set.
+        
+        Consecutive denoising steps often produce near-identical transformer
+        inputs; the cache hook reuses residuals from the previous step instead
+        of running the full transformer forward. That trades some fidelity for
+        speed, so it only runs when requested. Skipped silently if the
+        installed diffusers version or the transformer doesn't support caching.
+        
+        Args:
+            pipeline: Loaded FIBO pipeline
+        """
+        if self.cache_config is None or self.cache_config is False:
+            return
+        
+        transformer = getattr(pipeline, 'transformer', None)
+        if transformer is None or not hasattr(transformer, 'enable_cache'):
+            logger.info("Transformer caching not supported, running full denoising steps")
+            return
+        
+        try:
+            cache_config = self.cache_config
+            if cache_config is True:
+                from diffusers import FirstBlockCacheConfig
+                cache_config = FirstBlockCacheConfig(threshold=0.08)
+            
+            # Pyramid Attention Broadcast needs to know the current timestep
+            if hasattr(cache_config, 'current_timestep_callback') and cache_config.current_timestep_callback is None:
+                cache_config.current_timestep_callback = lambda: pipeline.current_timestep
+            
+            transformer.enable_cache(cache_config)
+            logger.info(f"✓ Transformer cache enabled ({type(cache_config).__name__})")
+        except Exception as e:
+            logger.info(f"Transformer cache not available: {e}")
+    
     def image_to_json(
         self,
         image_path: Union[str, Path],
-        prompt: Optional[str] = None
+        prompt: Optional[str] = None,
+        image: Optional[Image.Image] = None
     ) -> Dict[str, Any]:
         """
         Convert product image to Master JSON using VLM Bridge.
@@ -166,6 +865,7 @@ class FiboPipelineManager:
         Args:
             image_path: Path to product image
             prompt: Optional text prompt to guide analysis
+            image: Optional already-decoded RGB image (see iter_prefetched_images)
         
         Returns:
             Dictionary containing Master JSON with locked/variable parameters
@@ -175,16 +875,147 @@ class FiboPipelineManager:
         """
         logger.info(f"Converting image to Master JSON: {image_path}")
         
-        if self.use_cloud_api or self.vlm_pipeline is None:
+        cache_key = self._vlm_cache_key(image_path, prompt)
+        cached = self._vlm_cache_get(cache_key)
+        if cached is not None:
+            logger.info("✓ Master JSON served from VLM cache")
+            return self._refresh_cached_metadata(cached, image_path)
+        
+        master_json = self._image_to_json_impl(image_path, prompt, image)
+        
+        # Default structures returned on VLM failure carry a note; don't cache those
+        if cache_key is not None and "note" not in master_json.get("metadata", {}):
+            self._vlm_cache_put(cache_key, master_json)
+        
+        return master_json
+    
+    @staticmethod
+    def _refresh_cached_metadata(master_json: Dict[str, Any], image_path: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Give a cached Master JSON the metadata of a new campaign.
+        
+        Only the VLM-derived parameters are worth reusing; each campaign gets
+        its own campaign_id and created_at.
+        
+        Args:
+            master_json: Copy of the cached Master JSON (modified in place)
+            image_path: Path the image was requested under
+        
+        Returns:
+            The updated Master JSON
+        """
+        metadata = master_json.setdefault("metadata", {})
+        metadata["source_image"] = str(image_path)
+        metadata["campaign_id"] = _new_campaign_id()
+        metadata["created_at"] = datetime.now().isoformat()
+        return master_json
+    
+    def _vlm_cache_key(self, image_path: Union[str, Path], prompt: Optional[str]) -> Optional[str]:
+        """
+        Build the VLM cache key from the image bytes and prompt.
+        
+        The key also covers VLM_CACHE_VERSION and the sanitizer's mapping
+        table, so entries produced under an older prompt or mapping miss.
+        
+        Args:
+            image_path: Path to product image
+            prompt: Optional text prompt
+        
+        Returns:
+            Hex digest key, or None if caching is off or the image can't be read
+        """
+        if not self.vlm_cache:
+            return None
+        
+        try:
+            image_bytes = Path(image_path).read_bytes()
+        except OSError:
+            return None
+        
+        digest = hashlib.blake2b(image_bytes, digest_size=16)
+        digest.update((prompt or "").encode('utf-8'))
+        digest.update(f"{VLM_CACHE_VERSION}:{self.sanitizer.mappings_digest}".encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _vlm_cache_get(self, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached Master JSON, in memory first and then on disk.
+        
+        Args:
+            cache_key: Key from _vlm_cache_key
+        
+        Returns:
+            Copy of the cached Master JSON, or None on a miss
+        """
+        if cache_key is None:
+            return None
+        
+        with self._vlm_cache_lock:
+            if cache_key in self._vlm_cache:
+                self._vlm_cache.move_to_end(cache_key)
+                return copy.deepcopy(self._vlm_cache[cache_key])
+        
+        if self.vlm_cache_dir is None:
+            return None
+        
+        cache_file = self.vlm_cache_dir / f"{cache_key}.json"
+        try:
+            master_json = json_loads(cache_file.read_bytes())
+        except (OSError, json.JSONDecodeError):
+            return None
+        
+        self._vlm_cache_put(cache_key, master_json, persist=False)
+        return master_json
+    
+    def _vlm_cache_put(self, cache_key: str, master_json: Dict[str, Any], persist: bool = True):
+        """
+        Store a Master JSON in the LRU cache and optionally on disk.
+        
+        Args:
+            cache_key: Key from _vlm_cache_key
+            master_json: Master JSON to cache
+            persist: Also write it under vlm_cache_dir for other processes
+        """
+        with self._vlm_cache_lock:
+            self._vlm_cache[cache_key] = copy.deepcopy(master_json)
+            self._vlm_cache.move_to_end(cache_key)
+            while len(self._vlm_cache) > VLM_CACHE_SIZE:
+                self._vlm_cache.popitem(last=False)
+        
+        if not persist or self.vlm_cache_dir is None:
+            return
+        
+        try:
+            self.vlm_cache_dir.mkdir(parents=True, exist_ok=True)
+            json_dump_file(master_json, self.vlm_cache_dir / f"{cache_key}.json")
+        except OSError as e:
+            logger.warning(f"Could not persist VLM cache entry: {e}")
+    
+    def _image_to_json_local(
+        self,
+        image_path: Union[str, Path],
+        prompt: Optional[str] = None,
+        image: Optional[Image.Image] = None
+    ) -> Dict[str, Any]:
+        """
+        Convert image to Master JSON with the local VLM, falling back to Cloud API.
+        
+        Args:
+            image_path: Path to product image
+            prompt: Optional text prompt to guide analysis
+            image: Optional already-decoded RGB image (see iter_prefetched_images)
+        
+        Returns:
+            Dictionary containing Master JSON with locked/variable parameters
+        """
+        if self.vlm_pipeline is None:
             logger.info("Using Cloud API for image-to-JSON conversion")
             return self._image_to_json_cloud(image_path, prompt)
         
         try:
-            # Load image
-            image = Image.open(image_path).convert('RGB')
-            
             # Use VLM pipeline to analyze image
-            result = self.vlm_pipeline(image)
+            with self._vlm_on_device():
+                result = self._run_vlm(image_path, image)
             
             # Extract JSON from VLM output
             json_params = self._parse_vlm_output(result)
@@ -197,6 +1028,174 @@ class FiboPipelineManager:
             logger.info("Falling back to Cloud API")
             return self._image_to_json_cloud(image_path, prompt)
     
+    @contextmanager
+    def _vlm_on_device(self):
+        """
+        Keep the VLM on the GPU for the duration of the block.
+        
+        Nested and concurrent blocks share one residency: the model is moved
+        up when the first one enters and offloaded when the last one exits,
+        so a batch run (and its per-image fallback) offloads only once.
+        """
+        with self._vlm_residency_lock:
+            if self._vlm_users == 0:
+                self._move_vlm(self.device)
+            self._vlm_users += 1
+        try:
+            yield
+        finally:
+            with self._vlm_residency_lock:
+                self._vlm_users -= 1
+                if self._vlm_users == 0:
+                    self._move_vlm('cpu')
+    
+    def _move_vlm(self, device: str):
+        """
+        Move the VLM model between the GPU and pinned CPU memory.
+        
+        No-op unless cpu_offload_vlm is set and running on CUDA. 8-bit
+        quantized models can't be moved and are left in place. The pinned
+        host buffers are allocated on the first offload and copied into on
+        later ones, rather than reallocating and re-pinning the whole model
+        each time. Freed GPU blocks stay in PyTorch's caching allocator,
+        where FIBO can reuse them.
+        
+        Args:
+            device: Target device ('cpu' to offload, self.device to restore)
+        """
+        if not self.cpu_offload_vlm or self.device != 'cuda':
+            return
+        
+        model = getattr(self.vlm_pipeline, 'model', None)
+        if model is None or getattr(model, 'is_loaded_in_8bit', False):
+            return
+        
+        tensors = list(model.parameters()) + list(model.buffers())
+        if device == 'cpu':
+            if self._vlm_host_tensors is None:
+                self._vlm_host_tensors = [
+                    torch.empty(tensor.shape, dtype=tensor.dtype, pin_memory=True)
+                    for tensor in tensors
+                ]
+            for tensor, host in zip(tensors, self._vlm_host_tensors):
+                host.copy_(tensor.data, non_blocking=True)
+            # The copies must land before the GPU tensors are released
+            torch.cuda.current_stream().synchronize()
+            for tensor, host in zip(tensors, self._vlm_host_tensors):
+                tensor.data = host
+        else:
+            # Pinned sources let these uploads run asynchronously
+            for tensor in tensors:
+                tensor.data = tensor.data.to(device, non_blocking=True)
+    
+    def iter_prefetched_images(
+        self,
+        image_paths: Iterable[Union[str, Path]],
+        prefetch: int = 2
+    ) -> Iterator[Tuple[Path, Any]]:
+        """
+        Yield decoded images while the next ones are decoded in the background.
+        
+        Decoding runs on worker threads (PIL releases the GIL while decoding),
+        so it overlaps with whatever GPU work the caller does between
+        iterations. Pass the images to image_to_json(path, image=...).
+        
+        Args:
+            image_paths: Paths of images to decode
+            prefetch: Number of images to decode ahead
+        
+        Yields:
+            (path, RGB PIL Image) pairs, in order
+        """
+        paths = iter(image_paths)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pending = deque()
+            for path in paths:
+                pending.append((Path(path), executor.submit(self._open_rgb_draft, path)))
+                if len(pending) > prefetch:
+                    break
+            
+            while pending:
+                path, future = pending.popleft()
+                next_path = next(paths, None)
+                if next_path is not None:
+                    pending.append((Path(next_path), executor.submit(self._open_rgb_draft, next_path)))
+                yield path, future.result()
+    
+    def _run_vlm(self, image_path: Union[str, Path], image: Optional[Image.Image] = None) -> Any:
+        """
+        Run the VLM on a single image (see _run_vlm_batch).
+        
+        Args:
+            image_path: Path to product image
+            image: Optional already-decoded RGB image
+        
+        Returns:
+            VLM output in image-to-text pipeline format
+        """
+        return self._run_vlm_batch([image_path], [image])[0]
+    
+    def _run_vlm_batch(
+        self,
+        image_paths: List[Union[str, Path]],
+        images: Optional[List[Optional[Image.Image]]] = None
+    ) -> List[Any]:
+        """
+        Run the VLM pipeline on several images as one batch.
+        
+        The pipeline wrapper is kept so the VLM Bridge gets its full inputs
+        (prompt included) from its own preprocessing; images not passed in
+        are decoded with _open_rgb_draft.
+        
+        Args:
+            image_paths: Paths to product images
+            images: Optional already-decoded RGB images, aligned with image_paths
+        
+        Returns:
+            One VLM output per image, in image-to-text pipeline format
+        """
+        images = images or [None] * len(image_paths)
+        images = [
+            image if image is not None else self._open_rgb_draft(path)
+            for path, image in zip(image_paths, images)
+        ]
+        
+        pipe = self.vlm_pipeline
+        if len(images) == 1:
+            return [pipe(images[0])]
+        return pipe(images, batch_size=len(images))
+    
+    def _open_rgb_draft(self, image_path: Union[str, Path]) -> Image.Image:
+        """
+        Open an image as RGB, letting JPEG decode at reduced resolution.
+        
+        The VLM resizes its input to a few hundred pixels, so decoding a 4K
+        product shot at full size is wasted work. Image.draft lets libjpeg
+        scale down by 1/2-1/8 during decode while staying at least as large
+        as the processor's input size. It's a no-op for PNG and other formats.
+        
+        Args:
+            image_path: Path to image file
+        
+        Returns:
+            RGB PIL Image
+        """
+        with Image.open(image_path) as image:
+            image.draft('RGB', (self._vlm_input_size(),) * 2)
+            return image.convert('RGB')
+    
+    def _vlm_input_size(self) -> int:
+        """
+        Get the VLM image processor's input edge length.
+        
+        Returns:
+            Largest configured processor size, or 512 if unknown
+        """
+        size = getattr(getattr(self._vlm_pipeline, 'image_processor', None), 'size', None)
+        if isinstance(size, dict):
+            size = max((v for v in size.values() if isinstance(v, int)), default=None)
+        return size if isinstance(size, int) else 512
+    
     def _parse_vlm_output(self, vlm_result: Any) -> Dict[str, Any]:
         """
         Parse VLM pipeline output into structured JSON.
@@ -211,29 +1210,7 @@ class FiboPipelineManager:
         # Actual parsing depends on VLM output format
         
         # Default structure based on design document
-        json_params = {
-            "version": "1.0",
-            "metadata": {
-                "source": "vlm_analysis",
-                "model": "briaai/FIBO-VLM-prompt-to-JSON"
-            },
-            "locked_parameters": {
-                "camera_angle": "eye_level",  # Will be extracted from VLM
-                "focal_length": 50,
-                "aspect_ratio": "1:1",
-                "product_geometry": {
-                    "position": [0.5, 0.5],
-                    "scale": 1.0,
-                    "rotation": 0
-                }
-            },
-            "variable_parameters": {
-                "background": "neutral",
-                "lighting_type": "soft_natural",
-                "environment": "studio",
-                "mood": "professional"
-            }
-        }
+        json_params = copy.deepcopy(_DEFAULT_VLM_JSON_TEMPLATE)
         
         # TODO: Parse actual VLM output when available
         logger.warning("Using placeholder VLM parsing - needs actual implementation")
@@ -243,7 +1220,8 @@ class FiboPipelineManager:
     def _image_to_json_cloud(
         self,
         image_path: Union[str, Path],
-        prompt: Optional[str] = None
+        prompt: Optional[str] = None,
+        image: Optional[Image.Image] = None
     ) -> Dict[str, Any]:
         """
         Convert image to Master JSON using Cloud API with sanitization.
@@ -258,6 +1236,7 @@ class FiboPipelineManager:
         Args:
             image_path: Path to product image
             prompt: Optional text prompt to guide analysis
+            image: Unused; accepted so both backends share a signature
         
         Returns:
             Master JSON dictionary with locked/variable parameters
@@ -288,7 +1267,7 @@ class FiboPipelineManager:
             
             # Parse JSON string
             try:
-                structured_prompt = json.loads(structured_prompt_str)
+                structured_prompt = json_loads(structured_prompt_str)
             except json.JSONDecodeError as e:
                 logger.error(f"Failed to parse VLM output as JSON: {e}")
                 logger.warning("Using default parameters")
@@ -309,7 +1288,7 @@ class FiboPipelineManager:
                 "metadata": {
                     "created_at": datetime.now().isoformat(),
                     "source_image": str(image_path),
-                    "campaign_id": f"campaign_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                    "campaign_id": _new_campaign_id(),
                     "vlm_model": "briaai/FIBO-VLM-prompt-to-JSON"
                 },
                 "locked_parameters": locked_params,
@@ -334,27 +1313,7 @@ class FiboPipelineManager:
         Returns:
             Default structured prompt dictionary
         """
-        return {
-            "short_description": "Professional product photo",
-            "photographic_characteristics": {
-                "camera_angle": "eye_level",
-                "lens_focal_length": "50mm",
-                "depth_of_field": "shallow",
-                "focus": "sharp focus on subject"
-            },
-            "lighting": {
-                "conditions": "soft_natural",
-                "direction": "front lighting",
-                "shadows": "soft shadows"
-            },
-            "style_medium": "photograph",
-            "background_setting": "neutral studio background",
-            "aesthetics": {
-                "composition": "centered",
-                "color_scheme": "neutral tones",
-                "mood_atmosphere": "professional"
-            }
-        }
+        return copy.deepcopy(_DEFAULT_STRUCTURED_PROMPT)
     
     def _get_default_master_json(self, image_path: Union[str, Path]) -> Dict[str, Any]:
         """
@@ -371,30 +1330,10 @@ class FiboPipelineManager:
             "metadata": {
                 "created_at": datetime.now().isoformat(),
                 "source_image": str(image_path),
-                "campaign_id": f"campaign_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                "campaign_id": _new_campaign_id(),
                 "note": "Default parameters used due to VLM failure"
             },
-            "locked_parameters": {
-                "photographic_characteristics": {
-                    "camera_angle": "eye_level",
-                    "lens_focal_length": "50mm",
-                    "depth_of_field": "shallow",
-                    "focus": "sharp focus on subject"
-                },
-                "composition": "centered"
-            },
-            "variable_parameters": {
-                "background_setting": "neutral studio background",
-                "lighting": {
-                    "conditions": "soft_natural",
-                    "direction": "front lighting",
-                    "shadows": "soft shadows"
-                },
-                "aesthetics": {
-                    "color_scheme": "neutral tones",
-                    "mood_atmosphere": "professional"
-                }
-            }
+            **copy.deepcopy(_DEFAULT_MASTER_JSON_TEMPLATE)
         }
     
     def generate_image(
@@ -419,36 +1358,192 @@ class FiboPipelineManager:
         Raises:
             RuntimeError: If generation fails
         """
-        logger.info(f"Generating image with seed={seed}, steps={num_inference_steps}")
+        return self.generate_images_batch([json_params], seed, num_inference_steps, guidance_scale)[0]
+    
+    def generate_images_batch(
+        self,
+        json_params_list: List[Dict[str, Any]],
+        seed: int = 42,
+        num_inference_steps: int = 50,
+        guidance_scale: float = 7.5
+    ) -> List[Image.Image]:
+        """
+        Generate several images from JSON parameters in one FIBO pipeline call.
+        
+        Locally the prompts are batched into a single denoising loop, so each
+        step's transformer weight reads are shared across the whole batch.
+        Image i is seeded with seed + i. The Cloud API path generates the
+        images one by one.
+        
+        Args:
+            json_params_list: List of FIBO parameter dictionaries
+            seed: Random seed for the first image
+            num_inference_steps: Number of denoising steps
+            guidance_scale: Guidance scale for generation
+        
+        Returns:
+            List of generated PIL Images, in the order of json_params_list
+        """
+        seeds = [seed + i for i in range(len(json_params_list))]
+        logger.info(f"Generating {len(seeds)} image(s) with seed={seed}, steps={num_inference_steps}")
+        return self._generate_images_impl(json_params_list, seeds, num_inference_steps, guidance_scale)
+    
+    def _generate_images_local(
+        self,
+        json_params_list: List[Dict[str, Any]],
+        seeds: List[int],
+        num_inference_steps: int,
+        guidance_scale: float
+    ) -> List[Image.Image]:
+        """
+        Generate a batch of images with the local FIBO pipeline, falling back to Cloud API.
+        
+        Args:
+            json_params_list: List of FIBO parameter dictionaries
+            seeds: Per-image random seeds
+            num_inference_steps: Number of denoising steps
+            guidance_scale: Guidance scale for generation
         
-        if self.use_cloud_api or self.fibo_pipeline is None:
+        Returns:
+            List of generated PIL Images
+        """
+        if self.fibo_pipeline is None:
             logger.info("Using Cloud API for image generation")
-            return self._generate_image_cloud(json_params, seed, num_inference_steps, guidance_scale)
+            return self._generate_images_cloud(json_params_list, seeds, num_inference_steps, guidance_scale)
         
         try:
             # Set seed for reproducibility
             if not TORCH_AVAILABLE:
                 raise RuntimeError("PyTorch not available for local generation")
-            generator = torch.Generator(device=self.device).manual_seed(seed)
+            generators = self._get_generators(seeds)
             
-            # Generate image using FIBO pipeline
+            # Generate images using FIBO pipeline
             # Note: The exact API depends on Bria's implementation
-            result = self.fibo_pipeline(
-                prompt=json_params,  # FIBO accepts JSON directly
-                num_inference_steps=num_inference_steps,
-                guidance_scale=guidance_scale,
-                generator=generator
-            )
+            graph_key = (len(json_params_list), num_inference_steps, guidance_scale)
+            capturing = self._transformer_compiled() and graph_key not in self._graph_keys
+            if capturing:
+                logger.info(f"Capturing CUDA graphs for batch={graph_key[0]}, steps={num_inference_steps}")
+            
+            try:
+                result = self._run_fibo(json_params_list, num_inference_steps, guidance_scale, generators)
+            except Exception as e:
+                if not capturing:
+                    raise
+                # Some ops aren't graph-safe; drop back to the eager transformer and retry
+                logger.warning(f"CUDA graph capture failed ({e}), switching to eager transformer")
+                self.fibo_pipeline.transformer = self.fibo_pipeline.transformer._orig_mod
+                result = self._run_fibo(json_params_list, num_inference_steps, guidance_scale, self._get_generators(seeds))
+            self._graph_keys.add(graph_key)
             
-            image = result.images[0]
-            logger.info("✓ Image generated successfully")
+            images = list(result.images)
+            logger.info(f"✓ {len(images)} image(s) generated successfully")
             
-            return image
+            return images
             
         except Exception as e:
             logger.error(f"Local image generation failed: {e}")
             logger.info("Falling back to Cloud API")
-            return self._generate_image_cloud(json_params, seed, num_inference_steps, guidance_scale)
+            return self._generate_images_cloud(json_params_list, seeds, num_inference_steps, guidance_scale)
+    
+    def _run_fibo(
+        self,
+        json_params_list: List[Dict[str, Any]],
+        num_inference_steps: int,
+        guidance_scale: float,
+        generators: List[Any]
+    ) -> Any:
+        """
+        Call the local FIBO pipeline under inference mode and the attention/autocast contexts.
+        
+        Args:
+            json_params_list: List of FIBO parameter dictionaries
+            num_inference_steps: Number of denoising steps
+            guidance_scale: Guidance scale for generation
+            generators: Seeded torch.Generators, one per prompt
+        
+        Returns:
+            Raw pipeline output
+        """
+        # inference_mode skips autograd version counting and view tracking entirely
+        with torch.inference_mode(), self._attention_context(), self._autocast_context():
+            return self.fibo_pipeline(
+                prompt=json_params_list,  # FIBO accepts JSON directly
+                num_inference_steps=num_inference_steps,
+                guidance_scale=guidance_scale,
+                generator=generators
+            )
+    
+    def _transformer_compiled(self) -> bool:
+        """
+        Check whether the FIBO transformer is wrapped by torch.compile.
+        
+        Returns:
+            True if the transformer is a compiled (CUDA-graph replayed) module
+        """
+        return hasattr(getattr(self.fibo_pipeline, 'transformer', None), '_orig_mod')
+    
+    def _generate_images_cloud(
+        self,
+        json_params_list: List[Dict[str, Any]],
+        seeds: List[int],
+        num_inference_steps: int,
+        guidance_scale: float
+    ) -> List[Image.Image]:
+        """
+        Generate a list of images via the Cloud API, one request per image.
+        
+        Requests for a multi-image batch run concurrently on a thread pool.
+        
+        Args:
+            json_params_list: List of FIBO parameter dictionaries
+            seeds: Per-image random seeds
+            num_inference_steps: Denoising steps
+            guidance_scale: Guidance scale
+        
+        Returns:
+            List of generated PIL Images
+        """
+        if len(json_params_list) == 1:
+            return [self._generate_image_cloud(json_params_list[0], seeds[0], num_inference_steps, guidance_scale)]
+        
+        # Requests are network-bound, so run them concurrently (order preserved)
+        with ThreadPoolExecutor(max_workers=CLOUD_BATCH_WORKERS) as executor:
+            return list(executor.map(
+                lambda item: self._generate_image_cloud(item[0], item[1], num_inference_steps, guidance_scale),
+                zip(json_params_list, seeds)
+            ))
+    
+    def _get_generator(self, seed: int) -> Any:
+        """
+        Return this thread's first cached torch.Generator, re-seeded with seed.
+        
+        Args:
+            seed: Random seed for reproducibility
+        
+        Returns:
+            Seeded torch.Generator on self.device
+        """
+        return self._get_generators([seed])[0]
+    
+    def _get_generators(self, seeds: List[int]) -> List[Any]:
+        """
+        Return this thread's cached torch.Generators, re-seeded with seeds.
+        
+        The per-thread pool grows to the largest batch seen and is reused.
+        
+        Args:
+            seeds: One random seed per generator
+        
+        Returns:
+            List of seeded torch.Generators on self.device
+        """
+        generators = getattr(self._generator_cache, 'generators', None)
+        if generators is None:
+            generators = []
+            self._generator_cache.generators = generators
+        while len(generators) < len(seeds):
+            generators.append(torch.Generator(device=self.device))
+        return [generator.manual_seed(s) for generator, s in zip(generators, seeds)]
     
     def _generate_image_cloud(
         self,
@@ -574,8 +1669,7 @@ class FiboPipelineManager:
             # Convert to structured_prompt format
             structured_prompt_json = self._convert_to_structured_prompt(json_params)
             
-            import json
-            structured_prompt_str = json.dumps(structured_prompt_json)
+            structured_prompt_str = json_dumps(structured_prompt_json).decode('utf-8')
             
             logger.info(f"Using FIBO generation with structured_prompt (length: {len(structured_prompt_str)} chars)")
             
@@ -631,29 +1725,14 @@ class FiboPipelineManager:
             if "description" in first_object:
                 parts.append(first_object["description"])
         
-        # Add background
-        if "background_setting" in variable:
-            parts.append(f"Background: {variable['background_setting']}")
-        
-        # Add lighting
-        if "lighting" in variable:
-            lighting = variable["lighting"]
-            if "conditions" in lighting:
-                parts.append(f"Lighting: {lighting['conditions']}")
-        
-        # Add mood/atmosphere
-        if "aesthetics" in variable:
-            aesthetics = variable["aesthetics"]
-            if "mood_atmosphere" in aesthetics:
-                parts.append(f"Mood: {aesthetics['mood_atmosphere']}")
-        
-        # Join all parts
-        prompt = ". ".join(parts)
+        # Add background, lighting and mood/atmosphere
+        for path, label in _PROMPT_FIELDS:
+            value = _lookup(variable, path)
+            if value is not _MISSING:
+                parts.append(f"{label}: {value}")
         
-        # Add professional photography keywords
-        prompt += ". Professional product photography, high quality, detailed"
-        
-        return prompt
+        # Join all parts and add professional photography keywords
+        return ". ".join(parts) + ". Professional product photography, high quality, detailed"
     
     def _convert_to_structured_prompt(self, region_json: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -754,13 +1833,87 @@ class FiboPipelineManager:
             output_path = Path(output_path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_path, 'w') as f:
-                json.dump(master_json, f, indent=2)
+            json_dump_file(master_json, output_path, indent=True)
             
             logger.info(f"✓ Master JSON saved to: {output_path}")
         
         return master_json
     
+    def create_master_jsons_from_images(
+        self,
+        image_paths: List[Union[str, Path]],
+        batch_size: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        Create Master JSONs for several product images.
+        
+        Locally, cache misses are run through the VLM in batches of
+        batch_size; on the Cloud API the requests run concurrently. Each image
+        is handled independently: a failure yields the default Master JSON for
+        that image only.
+        
+        Args:
+            image_paths: Paths to product images
+            batch_size: Images per local VLM batch
+        
+        Returns:
+            Master JSON dictionaries, in the order of image_paths
+        """
+        paths = [Path(path) for path in image_paths]
+        logger.info(f"Creating Master JSON for {len(paths)} images")
+        
+        if self.use_cloud_api or self.vlm_pipeline is None:
+            with ThreadPoolExecutor(max_workers=CLOUD_BATCH_WORKERS) as executor:
+                return list(executor.map(self.image_to_json, paths))
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(paths)
+        misses = []
+        for index, path in enumerate(paths):
+            cached = self._vlm_cache_get(self._vlm_cache_key(path, None))
+            if cached is not None:
+                results[index] = self._refresh_cached_metadata(cached, path)
+            else:
+                misses.append(index)
+        
+        # One VLM residency for all batches rather than an offload per batch
+        with self._vlm_on_device() if misses else nullcontext():
+            for start in range(0, len(misses), batch_size):
+                batch = misses[start:start + batch_size]
+                for index, master_json in zip(batch, self._image_to_json_local_batch([paths[i] for i in batch])):
+                    results[index] = master_json
+        
+        return results
+    
+    def _image_to_json_local_batch(self, image_paths: List[Path]) -> List[Dict[str, Any]]:
+        """
+        Run one batch of images through the local VLM and cache the results.
+        
+        Falls back to per-image image_to_json if the batched call fails.
+        
+        Args:
+            image_paths: Paths to product images
+        
+        Returns:
+            Master JSON dictionaries, in the order of image_paths
+        """
+        try:
+            images = [image for _, image in self.iter_prefetched_images(image_paths)]
+            with self._vlm_on_device():
+                outputs = self._run_vlm_batch(image_paths, images)
+        except Exception as e:
+            logger.error(f"Batched local image-to-JSON failed: {e}")
+            logger.info("Falling back to per-image conversion")
+            return [self.image_to_json(path) for path in image_paths]
+        
+        results = []
+        for path, output in zip(image_paths, outputs):
+            master_json = self._parse_vlm_output(output)
+            cache_key = self._vlm_cache_key(path, None)
+            if cache_key is not None:
+                self._vlm_cache_put(cache_key, master_json)
+            results.append(master_json)
+        return results
+    
     def get_status(self) -> Dict[str, Any]:
         """
         Get current pipeline status.
@@ -768,27 +1921,42 @@ class FiboPipelineManager:
         Returns:
             Dictionary with pipeline status information
         """
+        # Don't let a status poll import torch just to probe the driver:
+        # until a local code path has loaded it, CUDA isn't in use
+        cuda_available = self._cuda_available
+        if cuda_available is None:
+            torch_imported = torch is not None and getattr(torch, '_module', None) is not None
+            cuda_available = (
+                self._is_cuda_available()
+                if torch_imported and not self.use_cloud_api else False
+            )
+        
         return {
             "device": self.device,
-            "vlm_pipeline_loaded": self.vlm_pipeline is not None,
-            "fibo_pipeline_loaded": self.fibo_pipeline is not None,
+            "vlm_pipeline_loaded": self._vlm_pipeline is not None,
+            "fibo_pipeline_loaded": self._fibo_pipeline is not None,
             "using_cloud_api": self.use_cloud_api,
             "torch_available": TORCH_AVAILABLE,
-            "cuda_available": torch.cuda.is_available() if TORCH_AVAILABLE else False,
+            "dtype": str(self.dtype) if self.dtype is not None else None,
+            "quantization": self.quantization,
+            # Per-component placement when loaded with a device_map (e.g. across GPUs)
+            "fibo_device_map": getattr(self._fibo_pipeline, 'hf_device_map', None),
+            "cuda_available": cuda_available,
             "api_manager_ready": self.api_manager is not None,
             "sanitizer_ready": self.sanitizer is not None
         }
 
 
 # Convenience function for quick initialization
-def create_pipeline_manager(use_local: bool = True) -> FiboPipelineManager:
+def create_pipeline_manager(use_local: bool = True, warmup: bool = True) -> FiboPipelineManager:
     """
     Create and initialize FIBO Pipeline Manager.
     
     Args:
         use_local: Whether to attempt local GPU initialization
+        warmup: Load and warm up the local pipelines before returning
     
     Returns:
         Initialized FiboPipelineManager instance
     """
-    return FiboPipelineManager(use_local=use_local)
+    return FiboPipelineManager(use_local=use_local, warmup=warmup)
@@ -3,10 +3,47 @@ Schema Sanitizer for FIBO VLM Output
 Validates and corrects VLM-generated structured prompts to ensure valid FIBO parameters
 """
 
-import json
-from typing import Dict, Any, Optional, Union
+import hashlib
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
 
+from src.json_utils import json_loads
+
+# Optional Aho-Corasick automaton (pyahocorasick) for partial matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+# Maximum distinct (value, parameter) pairs memoized per sanitizer
+SANITIZE_CACHE_SIZE = 4096
+
+# Common focal length descriptions → focal lengths
+_FOCAL_LENGTH_MAPPINGS = {
+    "macro": "macro",
+    "wide": "24mm",
+    "wide angle": "24mm",
+    "standard": "50mm",
+    "portrait": "85mm",
+    "telephoto": "200mm"
+}
+
+# Any focal length description, scanned in one pass (longer phrases first)
+_FOCAL_RE = re.compile(
+    "|".join(re.escape(key) for key in sorted(_FOCAL_LENGTH_MAPPINGS, key=len, reverse=True))
+)
+
+# Table order decides between several descriptions in one value
+_FOCAL_PRIORITY = {key: rank for rank, key in enumerate(_FOCAL_LENGTH_MAPPINGS)}
+
+# Separator between keys in the joined reverse-match string; never in a key
+_KEY_SEPARATOR = "\x00"
+
 
 class SchemaSanitizer:
     """
@@ -16,6 +53,15 @@ class SchemaSanitizer:
     but may use free-form text that needs to be mapped to FIBO's specific enumerations.
     """
     
+    # Photographic fields locked for product geometry
+    _LOCKED_PHOTO_FIELDS = ("camera_angle", "lens_focal_length", "depth_of_field", "focus")
+    
+    # Top-level sections passed through unchanged as variable parameters
+    _VARIABLE_SECTIONS = ("background_setting", "lighting")
+    
+    # Aesthetics fields that can vary per region
+    _VARIABLE_AESTHETICS_FIELDS = ("color_scheme", "mood_atmosphere")
+    
     def __init__(self, mapping_file: Optional[str] = None):
         """
         Initialize Schema Sanitizer with parameter mappings.
@@ -26,8 +72,58 @@ class SchemaSanitizer:
         if mapping_file is None:
             mapping_file = Path(__file__).parent / "vlm_to_fibo_map.json"
         
-        with open(mapping_file, 'r') as f:
-            self.mappings = json.load(f)
+        with open(mapping_file, 'rb') as f:
+            mapping_bytes = f.read()
+        self.mappings = json_loads(mapping_bytes)
+        # Identifies this mapping table, so results cached under an older one can be told apart
+        self.mappings_digest = hashlib.blake2b(mapping_bytes, digest_size=8).hexdigest()
+        
+        # Normalized lookup tables, built once: keys lowercased and stripped
+        # like the values they are matched against, and a longest-key-first
+        # copy so partial matches resolve to the most specific phrase
+        self._norm_mappings = {
+            parameter_type: {key.lower().strip(): value for key, value in mapping.items()}
+            for parameter_type, mapping in self.mappings.items()
+        }
+        self._keys_by_len = {
+            parameter_type: dict(sorted(mapping.items(), key=lambda item: -len(item[0])))
+            for parameter_type, mapping in self._norm_mappings.items()
+        }
+        
+        # Canonical FIBO values per parameter type, returned without matching
+        self._valid_values = {
+            parameter_type: frozenset(mapping.values())
+            for parameter_type, mapping in self.mappings.items()
+        }
+        
+        # Partial-match automata, built once per parameter type
+        self._matchers = {
+            parameter_type: self._build_matcher(mapping)
+            for parameter_type, mapping in self._keys_by_len.items()
+        } if AHOCORASICK_AVAILABLE else {}
+        
+        # Without pyahocorasick, partial matching loops over (key, key length,
+        # FIBO value) entries in the same priority order
+        self._partial_keys = {} if AHOCORASICK_AVAILABLE else {
+            parameter_type: [(key, len(key), fibo_value) for key, fibo_value in mapping.items()]
+            for parameter_type, mapping in self._keys_by_len.items()
+        }
+        
+        # The same free-form VLM phrases recur across campaigns; both value
+        # sanitizers are pure functions of their arguments, so memoize them
+        self._sanitize_value = lru_cache(maxsize=SANITIZE_CACHE_SIZE)(self._sanitize_value)
+        self._sanitize_focal_length = lru_cache(maxsize=SANITIZE_CACHE_SIZE)(self._sanitize_focal_length)
+        
+        # Field rules compiled once: (section or None for top level, field, sanitizer)
+        self._field_rules = (
+            ("photographic_characteristics", "camera_angle",
+             lambda value: self._sanitize_value(value, "camera_angle")),
+            ("photographic_characteristics", "lens_focal_length", self._sanitize_focal_length),
+            ("lighting", "conditions",
+             lambda value: self._sanitize_value(value, "lighting_type")),
+            (None, "style_medium",
+             lambda value: self._sanitize_value(value, "style_medium")),
+        )
     
     def sanitize(self, structured_prompt: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -39,48 +135,60 @@ class SchemaSanitizer:
         Returns:
             Sanitized structured prompt with valid FIBO parameters
         """
-        # Parse if string
-        if isinstance(structured_prompt, str):
-            prompt_dict = json.loads(structured_prompt)
+        # Parse if string; a freshly parsed prompt is private to this call
+        owned = isinstance(structured_prompt, str)
+        if owned:
+            prompt_dict = json_loads(structured_prompt)
         else:
-            prompt_dict = structured_prompt.copy()
+            prompt_dict = structured_prompt
         
-        # Sanitize photographic characteristics
-        if "photographic_characteristics" in prompt_dict:
-            photo = prompt_dict["photographic_characteristics"]
-            
-            # Sanitize camera_angle
-            if "camera_angle" in photo:
-                photo["camera_angle"] = self._sanitize_value(
-                    photo["camera_angle"],
-                    "camera_angle"
-                )
+        # Sanitize camera_angle, lens_focal_length, lighting conditions and
+        # style_medium. Only string values inside dict sections are mapped;
+        # anything else the VLM produced is passed through untouched.
+        # Sections of a caller's dict are copied only when one of their fields
+        # is rewritten, so it is never mutated (including nested dicts); a
+        # parsed prompt is updated in place instead.
+        updates = {}
+        for section, field, sanitize_field in self._field_rules:
+            if section is None:
+                value = prompt_dict.get(field)
+                if isinstance(value, str):
+                    updates[field] = sanitize_field(value)
+                continue
             
-            # Sanitize lens_focal_length (ensure it's a valid format)
-            if "lens_focal_length" in photo:
-                photo["lens_focal_length"] = self._sanitize_focal_length(
-                    photo["lens_focal_length"]
-                )
+            target = updates.get(section, prompt_dict.get(section))
+            if isinstance(target, dict) and isinstance(target.get(field), str):
+                if section not in updates:
+                    target = updates[section] = target if owned else dict(target)
+                target[field] = sanitize_field(target[field])
         
-        # Sanitize lighting
-        if "lighting" in prompt_dict:
-            lighting = prompt_dict["lighting"]
-            
-            # Sanitize lighting conditions
-            if "conditions" in lighting:
-                lighting["conditions"] = self._sanitize_value(
-                    lighting["conditions"],
-                    "lighting_type"
-                )
+        if owned:
+            prompt_dict.update(updates)
+            return prompt_dict
+        return {**prompt_dict, **updates}
+    
+    def _build_matcher(self, mapping: Dict[str, str]) -> Tuple[Any, str, List[int], List[str]]:
+        """
+        Precompile partial-match lookups for one parameter type.
         
-        # Sanitize style_medium
-        if "style_medium" in prompt_dict:
-            prompt_dict["style_medium"] = self._sanitize_value(
-                prompt_dict["style_medium"],
-                "style_medium"
-            )
+        Args:
+            mapping: VLM phrase → FIBO value mapping, in match priority order
+            
+        Returns:
+            Tuple of (automaton finding keys inside a value, all keys joined by
+            _KEY_SEPARATOR for finding a value inside a key, start offset of
+            each key in the joined string, FIBO values in key order)
+        """
+        automaton = ahocorasick.Automaton()
+        offsets = []
+        position = 0
+        for index, key in enumerate(mapping):
+            automaton.add_word(key, index)
+            offsets.append(position)
+            position += len(key) + len(_KEY_SEPARATOR)
+        automaton.make_automaton()
         
-        return prompt_dict
+        return automaton, _KEY_SEPARATOR.join(mapping), offsets, list(mapping.values())
     
     def _sanitize_value(
         self,
@@ -97,20 +205,37 @@ class SchemaSanitizer:
         Returns:
             Valid FIBO enumeration or original value if no mapping found
         """
-        if parameter_type not in self.mappings:
+        mapping = self._norm_mappings.get(parameter_type)
+        if mapping is None or value in self._valid_values[parameter_type]:
             return value
         
         # Normalize value for matching
         normalized = value.lower().strip()
         
         # Check for exact match
-        if normalized in self.mappings[parameter_type]:
-            return self.mappings[parameter_type][normalized]
+        if normalized in mapping:
+            return mapping[normalized]
         
         # Check for partial match
-        for key, fibo_value in self.mappings[parameter_type].items():
-            if key in normalized or normalized in key:
-                return fibo_value
+        matcher = self._matchers.get(parameter_type)
+        if matcher is not None:
+            # Longest mapping key that is contained in the value
+            # or contains it, found with C-level scans instead of a Python loop
+            automaton, joined_keys, offsets, fibo_values = matcher
+            best = min((index for _, index in automaton.iter(normalized)), default=len(fibo_values))
+            if _KEY_SEPARATOR not in normalized:
+                found = joined_keys.find(normalized)
+                if found >= 0:
+                    best = min(best, bisect_right(offsets, found) - 1)
+            if best < len(fibo_values):
+                return fibo_values[best]
+        else:
+            # Only the shorter string can be contained in the longer one
+            # (equal lengths are exact matches, handled above)
+            normalized_len = len(normalized)
+            for key, key_len, fibo_value in self._partial_keys[parameter_type]:
+                if (key in normalized) if key_len <= normalized_len else (normalized in key):
+                    return fibo_value
         
         # No match found, return original
         return value
@@ -125,24 +250,16 @@ class SchemaSanitizer:
         Returns:
             Sanitized focal length
         """
+        normalized = focal_length.lower()
+        
         # If it's already a number with mm, keep it
-        if "mm" in focal_length.lower():
+        if "mm" in normalized:
             return focal_length
         
-        # Map common descriptions to focal lengths
-        mappings = {
-            "macro": "macro",
-            "wide": "24mm",
-            "wide angle": "24mm",
-            "standard": "50mm",
-            "portrait": "85mm",
-            "telephoto": "200mm"
-        }
-        
-        normalized = focal_length.lower().strip()
-        for key, value in mappings.items():
-            if key in normalized:
-                return value
+        # Map the highest-priority common description to its focal length
+        keys = [match.group(0) for match in _FOCAL_RE.finditer(normalized)]
+        if keys:
+            return _FOCAL_LENGTH_MAPPINGS[min(keys, key=_FOCAL_PRIORITY.__getitem__)]
         
         return focal_length
     
@@ -162,13 +279,10 @@ class SchemaSanitizer:
         locked = {}
         
         # Lock photographic characteristics (product geometry)
-        if "photographic_characteristics" in structured_prompt:
-            photo = structured_prompt["photographic_characteristics"]
+        photo = structured_prompt.get("photographic_characteristics")
+        if photo is not None:
             locked["photographic_characteristics"] = {
-                "camera_angle": photo.get("camera_angle"),
-                "lens_focal_length": photo.get("lens_focal_length"),
-                "depth_of_field": photo.get("depth_of_field"),
-                "focus": photo.get("focus")
+                field: photo.get(field) for field in self._LOCKED_PHOTO_FIELDS
             }
         
         # Lock object descriptions (product itself)
@@ -176,8 +290,8 @@ class SchemaSanitizer:
             locked["objects"] = structured_prompt["objects"]
         
         # Lock composition (product positioning)
-        if "aesthetics" in structured_prompt:
-            aesthetics = structured_prompt["aesthetics"]
+        aesthetics = structured_prompt.get("aesthetics")
+        if aesthetics is not None:
             locked["composition"] = aesthetics.get("composition")
         
         return locked
@@ -197,20 +311,16 @@ class SchemaSanitizer:
         """
         variable = {}
         
-        # Variable: background setting
-        if "background_setting" in structured_prompt:
-            variable["background_setting"] = structured_prompt["background_setting"]
-        
-        # Variable: lighting (can change per region)
-        if "lighting" in structured_prompt:
-            variable["lighting"] = structured_prompt["lighting"]
+        # Variable: background setting and lighting (can change per region)
+        for section in self._VARIABLE_SECTIONS:
+            if section in structured_prompt:
+                variable[section] = structured_prompt[section]
         
         # Variable: aesthetics (mood, atmosphere, color scheme)
-        if "aesthetics" in structured_prompt:
-            aesthetics = structured_prompt["aesthetics"]
+        aesthetics = structured_prompt.get("aesthetics")
+        if aesthetics is not None:
             variable["aesthetics"] = {
-                "color_scheme": aesthetics.get("color_scheme"),
-                "mood_atmosphere": aesthetics.get("mood_atmosphere")
+                field: aesthetics.get(field) for field in self._VARIABLE_AESTHETICS_FIELDS
             }
         
         return variable
@@ -10,14 +10,17 @@ Professional web interface for campaign management with:
 """
 
 import streamlit as st
+import io
+import os
 import sys
 from pathlib import Path
+from typing import Any, Dict, Tuple
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from PIL import Image
-import json
+from json_utils import json_loads
+from ui.widgets import file_download_button, load_css
 
 # Page configuration
 st.set_page_config(
@@ -28,64 +31,75 @@ st.set_page_config(
 )
 
 # Custom CSS for professional styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: #1f2937;
-        margin-bottom: 0.5rem;
-    }
-    .sub-header {
-        font-size: 1.1rem;
-        color: #6b7280;
-        margin-bottom: 2rem;
-    }
-    .section-header {
-        font-size: 1.5rem;
-        font-weight: 600;
-        color: #374151;
-        margin-top: 2rem;
-        margin-bottom: 1rem;
-        border-bottom: 2px solid #e5e7eb;
-        padding-bottom: 0.5rem;
-    }
-    .info-box {
-        background-color: #f3f4f6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #3b82f6;
-        margin: 1rem 0;
-    }
-    .success-box {
-        background-color: #d1fae5;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #10b981;
-        margin: 1rem 0;
-    }
-    .warning-box {
-        background-color: #fef3c7;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #f59e0b;
-        margin: 1rem 0;
-    }
-    .stButton>button {
-        width: 100%;
-        background-color: #3b82f6;
-        color: white;
-        font-weight: 600;
-        padding: 0.75rem 1.5rem;
-        border-radius: 0.5rem;
-        border: none;
-        transition: background-color 0.2s;
-    }
-    .stButton>button:hover {
-        background-color: #2563eb;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(f"<style>{load_css('app.css')}</style>", unsafe_allow_html=True)
+
+# Display width of results gallery images in pixels
+GALLERY_WIDTH = 480
+
+# Largest preview edge in pixels
+PREVIEW_SIZE = (512, 512)
+
+# Pre-configured product images bundled with the app
+CANNED_IMAGES = {
+    "Luxury Wristwatch": Path("images/wristwatch.png"),
+    "Premium Headphones": Path("images/headphones.png")
+}
+
+
+def _encode_preview(image, size=PREVIEW_SIZE) -> bytes:
+    """Downscale an image to fit within size and encode it as PNG bytes."""
+    image.thumbnail(size)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@st.cache_resource
+def canned_previews() -> Dict[str, bytes]:
+    """Preview thumbnails of the bundled product images, built once per server process."""
+    from PIL import Image
+    
+    previews = {}
+    for name, image_path in CANNED_IMAGES.items():
+        if image_path.exists():
+            with Image.open(image_path) as image:
+                previews[name] = _encode_preview(image)
+    return previews
+
+
+@st.cache_data
+def load_upload_preview(image_bytes: bytes) -> bytes:
+    """Cached preview thumbnail of an uploaded image."""
+    from PIL import Image
+    
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        return _encode_preview(image)
+
+
+@st.cache_data
+def load_thumbnail(image_path: str, mtime: float) -> bytes:
+    """Cached gallery-width thumbnail of a generated image (mtime invalidates the entry)."""
+    from PIL import Image
+    
+    with Image.open(image_path) as image:
+        return _encode_preview(image, (GALLERY_WIDTH, GALLERY_WIDTH * 4))
+
+
+@st.cache_data
+def load_metadata(json_path: str, mtime: float) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Cached parameters file of a generated image (mtime invalidates the entry).
+    
+    Args:
+        json_path: Path to the *_params.json file
+        mtime: Modification time of the file
+        
+    Returns:
+        Tuple of (parsed metadata, raw file bytes for download)
+    """
+    raw = Path(json_path).read_bytes()
+    return json_loads(raw), raw
+
 
 # Initialize session state
 if 'master_json' not in st.session_state:
@@ -168,14 +182,10 @@ def product_setup_tab(campaign_id: str):
         )
         
         # Map selection to file path
-        image_path = None
+        image_path = CANNED_IMAGES.get(image_option)
         uploaded_file = None
         
-        if image_option == "Luxury Wristwatch":
-            image_path = Path("images/wristwatch.png")
-        elif image_option == "Premium Headphones":
-            image_path = Path("images/headphones.png")
-        else:
+        if image_path is None:
             # Custom upload
             uploaded_file = st.file_uploader(
                 "Upload Product Image",
@@ -188,12 +198,13 @@ def product_setup_tab(campaign_id: str):
         
         # Display preview
         preview_image = None
+        canned = canned_previews()
         
         if uploaded_file is not None:
-            preview_image = Image.open(uploaded_file)
+            preview_image = load_upload_preview(uploaded_file.getvalue())
             st.image(preview_image, caption="Custom Upload", use_container_width=True)
-        elif image_path and image_path.exists():
-            preview_image = Image.open(image_path)
+        elif image_option in canned:
+            preview_image = canned[image_option]
             st.image(preview_image, caption=image_option, use_container_width=True)
         else:
             st.info("👆 Select or upload an image to see preview")
@@ -343,35 +354,51 @@ def results_tab():
     for region_dir in region_dirs:
         region_name = region_dir.name
         
-        # Find images in this region
-        png_files = list(region_dir.glob("*_8bit.png"))
+        # One directory read per region; companion files are then looked up
+        # by name instead of an exists() check each
+        entries = {entry.name: entry for entry in os.scandir(region_dir)}
+        png_names = sorted(
+            (name for name in entries if name.endswith("_8bit.png")),
+            key=lambda name: entries[name].stat().st_mtime,
+            reverse=True
+        )
         
-        if png_files:
+        if png_names:
             st.markdown(f"### {region_name.replace('_', ' ').title()}")
             
-            for png_file in png_files[:3]:  # Show up to 3 most recent
+            for png_name in png_names[:3]:  # Show up to 3 most recent
                 # Extract metadata from filename
+                png_file = region_dir / png_name
                 base_name = png_file.stem.replace("_8bit", "")
                 tiff_file = region_dir / f"{base_name}_16bit.tif"
                 json_file = region_dir / f"{base_name}_params.json"
                 heatmap_file = region_dir / f"{base_name}_heatmap.png"
+                json_entry = entries.get(json_file.name)
+                heatmap_entry = entries.get(heatmap_file.name)
                 
                 col1, col2, col3 = st.columns([2, 2, 1])
                 
                 with col1:
-                    st.image(str(png_file), caption="Generated Image", use_container_width=True)
+                    st.image(
+                        load_thumbnail(str(png_file), entries[png_name].stat().st_mtime),
+                        caption="Generated Image",
+                        width=GALLERY_WIDTH
+                    )
                 
                 with col2:
-                    if heatmap_file.exists():
-                        st.image(str(heatmap_file), caption="Consistency Heatmap", use_container_width=True)
+                    if heatmap_entry is not None:
+                        st.image(
+                            load_thumbnail(str(heatmap_file), heatmap_entry.stat().st_mtime),
+                            caption="Consistency Heatmap",
+                            width=GALLERY_WIDTH
+                        )
                     else:
                         st.info("No heatmap available")
                 
                 with col3:
                     # Load JSON for metadata
-                    if json_file.exists():
-                        with open(json_file, 'r') as f:
-                            metadata = json.load(f)
+                    if json_entry is not None:
+                        metadata, json_bytes = load_metadata(str(json_file), json_entry.stat().st_mtime)
                         
                         # Display metadata
                         st.markdown("**Metadata:**")
@@ -398,32 +425,18 @@ def results_tab():
                     # Download buttons
                     st.markdown("**Downloads:**")
                     
-                    if tiff_file.exists():
-                        with open(tiff_file, 'rb') as f:
-                            st.download_button(
-                                "📥 TIFF (Print)",
-                                data=f.read(),
-                                file_name=tiff_file.name,
-                                mime="image/tiff"
-                            )
+                    if tiff_file.name in entries:
+                        file_download_button("📥 TIFF (Print)", tiff_file, "image/tiff")
                     
-                    if png_file.exists():
-                        with open(png_file, 'rb') as f:
-                            st.download_button(
-                                "📥 PNG (Web)",
-                                data=f.read(),
-                                file_name=png_file.name,
-                                mime="image/png"
-                            )
+                    file_download_button("📥 PNG (Web)", png_file, "image/png")
                     
-                    if json_file.exists():
-                        with open(json_file, 'rb') as f:
-                            st.download_button(
-                                "📥 JSON",
-                                data=f.read(),
-                                file_name=json_file.name,
-                                mime="application/json"
-                            )
+                    if json_entry is not None:
+                        st.download_button(
+                            "📥 JSON",
+                            data=json_bytes,
+                            file_name=json_file.name,
+                            mime="application/json"
+                        )
                 
                 st.markdown("---")
 
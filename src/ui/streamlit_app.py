@@ -11,17 +11,41 @@ Features:
 """
 
 import streamlit as st
+import streamlit.components.v1 as components
+import base64
+import hashlib
+import html
+import io
+import json
 import logging
+from datetime import datetime
 from pathlib import Path
 from PIL import Image
+# Register the formats this app reads and writes up front. Pillow falls back
+# to Image.init(), which imports every bundled format plugin, when no
+# registered plugin handles a file; uploads are decoded from bytes without an
+# extension hint, so e.g. a WebP upload would otherwise trigger it.
+from PIL import JpegImagePlugin, PngImagePlugin, TiffImagePlugin, WebPImagePlugin  # noqa: F401
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Any, Dict, Tuple
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.ui.widgets import file_download_button, load_css
+
+
+@st.cache_resource(show_spinner=False)
+def setup_logging() -> logging.Logger:
+    """Configure logging once per server process, however often the script reruns."""
+    logging.basicConfig(level=logging.INFO)
+    return logging.getLogger(__name__)
+
+
 # Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+logger = setup_logging()
 
 # Page configuration
 st.set_page_config(
@@ -31,140 +55,320 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for professional styling
-st.markdown("""
-<style>
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
+# Saved uploads, named by content hash
+UPLOAD_DIR = Path("output/uploads")
+
+
+@st.cache_resource(show_spinner=False)
+def ensure_output_dirs() -> Path:
+    """Create the output directories once per server process rather than per upload."""
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    return UPLOAD_DIR
+
+
+ensure_output_dirs()
+
+
+# Longest side of input image preview thumbnails, in pixels
+PREVIEW_MAX_SIDE = 512
+
+# Longest side of generated image thumbnails shown in results, in pixels
+THUMBNAIL_MAX_SIDE = 512
+
+# zlib level for re-encoding non-PNG uploads (1 = fastest)
+UPLOAD_PNG_COMPRESS_LEVEL = 1
+
+# Sample product images offered in the image input
+SAMPLE_IMAGES = {
+    "Luxury Wristwatch": "images/wristwatch.png",
+    "Premium Headphones": "images/headphones.png"
+}
+
+# Concurrent FIBO requests / output saves per campaign run
+GENERATION_WORKERS = 8
+
+# Saved region images (by PNG path) remembered per session for repeated runs
+GENERATION_CACHE_SIZE = 64
+
+# Per-region output files whose presence is recorded after saving
+ASSET_KINDS = ('png', 'tiff', 'json', 'heatmap')
+
+# Height of the header iframe in pixels
+HEADER_HEIGHT = 110
+
+# Static page chrome, built once at import time
+_HEADER_HTML = """
+<div class="main-header">
+    <h1>🌍 Global Brand Localizer</h1>
+    <p>AI-Powered Cultural Localization for Global Markets</p>
+</div>
+"""
+
+_QUICK_START_MD = """
+#### 🎯 Quick Start Guide
+1. **Upload/Select** product image
+2. **Choose regions** in sidebar
+3. **Generate** localized content
+4. **View results** in Gallery tab
+
+---
+#### ✨ Key Features
+- **🎨 Background Replacement** - Perfect product consistency
+- **📊 SSIM Verification** - Industry-standard metrics
+- **🔒 C2PA Ready** - Content credentials
+- **📁 Dual Output** - TIFF (print) + PNG (web)
+- **📋 JSON Audit Trail** - Complete documentation
+"""
+
+_FOOTER_HTML = """
+<div style="text-align: center; color: #999; padding: 0.5rem; font-size: 0.85rem;">
+    🌍 Global Brand Localizer | Powered by Bria AI
+</div>
+"""
+
+
+@st.cache_resource
+def get_pipeline_manager():
+    """
+    Shared Cloud API pipeline manager, created once per server process.
     
-    /* Custom header - more compact */
-    .main-header {
-        background: linear-gradient(90deg, #1f77b4, #ff7f0e);
-        padding: 1rem 1.5rem;
-        border-radius: 8px;
-        margin-bottom: 1.5rem;
-        color: white;
-        text-align: center;
-    }
+    Streamlit reruns the whole script on every interaction; caching the
+    manager keeps its API session, schema sanitizer and VLM cache alive
+    across reruns instead of rebuilding them per click.
+    """
+    from src.pipeline_manager import FiboPipelineManager
+    return FiboPipelineManager(use_local=False)  # Use Cloud API
+
+
+@st.cache_data(show_spinner=False)
+def load_image_file(path: str, mtime: float) -> Image.Image:
+    """
+    Decode an image on disk once per (path, mtime).
     
-    .main-header h1 {
-        margin: 0;
-        font-size: 1.8rem;
-        font-weight: 700;
-    }
+    Args:
+        path: Image file path
+        mtime: Modification time of the file, invalidating stale entries
+        
+    Returns:
+        Decoded PIL Image
+    """
+    with Image.open(path) as image:
+        image.load()
+        return image.copy()
+
+
+def peek_size_mode(path: str) -> Tuple[int, int, str]:
+    """
+    Read image dimensions and mode from the file header without decoding pixels.
     
-    .main-header p {
-        margin: 0.3rem 0 0 0;
-        font-size: 0.95rem;
-        opacity: 0.9;
-    }
+    Args:
+        path: Image file path
+        
+    Returns:
+        Tuple of (width, height, mode)
+    """
+    with Image.open(path) as image:
+        return image.size[0], image.size[1], image.mode
+
+
+def cached_image_info(path: str) -> Dict[str, Any]:
+    """
+    Header info of an image, remembered in the session's img_cache by path.
     
-    /* Card styling - more compact */
-    .custom-card {
-        background: white;
-        padding: 1rem;
-        border-radius: 8px;
-        border: 1px solid #e1e5e9;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        margin-bottom: 1rem;
-    }
+    Args:
+        path: Image file path
+        
+    Returns:
+        Dict with path, width, height and mode
+    """
+    img_cache = st.session_state.setdefault("img_cache", {})
+    if path not in img_cache:
+        width, height, mode = peek_size_mode(path)
+        img_cache[path] = {"path": path, "width": width, "height": height, "mode": mode}
+    return img_cache[path]
+
+
+@lru_cache(maxsize=8)
+def image_data_uri(path: str, mtime: float) -> str:
+    """
+    Base64 data URI of a preview thumbnail, built once per (path, mtime).
     
-    .custom-card h3 {
-        margin-top: 0;
-        font-size: 1.3rem;
-        color: #1f77b4;
-    }
+    The image is downscaled to PREVIEW_MAX_SIDE so reruns only carry a small
+    PNG; the full-resolution file is left for the pipeline. The result is an
+    immutable string, so a process-level lru_cache can hand it out directly
+    instead of st.cache_data unpickling a copy on every rerun.
     
-    .custom-card h4 {
-        margin-top: 1rem;
-        font-size: 1.1rem;
-        color: #2c3e50;
-    }
+    Args:
+        path: Image file path
+        mtime: Modification time of the file, invalidating stale entries
+        
+    Returns:
+        data: URI embedding the thumbnail PNG
+    """
+    with Image.open(path) as image:
+        image.thumbnail((PREVIEW_MAX_SIDE, PREVIEW_MAX_SIDE), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", optimize=True)
+    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return f"data:image/png;base64,{encoded}"
+
+
+def render_preview(path: str, caption: str):
+    """
+    Render a centered input image preview.
     
-    .custom-card ul, .custom-card ol {
-        margin: 0.5rem 0;
-        padding-left: 1.5rem;
-    }
+    By default the preview is a cached data-URI <img> tag, so reruns emit a
+    static HTML string instead of registering the image with Streamlit's
+    media manager again. The high-fidelity toggle falls back to st.image.
     
-    .custom-card li {
-        margin: 0.3rem 0;
-        font-size: 0.95rem;
-    }
+    Args:
+        path: Image file path
+        caption: Caption shown below the image
+    """
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        if st.session_state.get('high_fidelity_preview'):
+            st.image(path, caption=caption, use_container_width=True)
+        else:
+            uri = image_data_uri(path, Path(path).stat().st_mtime)
+            st.markdown(
+                f'<img src="{uri}" alt="{html.escape(caption)}" '
+                f'style="width:100%; max-width:{PREVIEW_MAX_SIDE}px"/>',
+                unsafe_allow_html=True
+            )
+            st.caption(caption)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def load_thumbnail(path: str, mtime: float, max_side: int = THUMBNAIL_MAX_SIDE) -> bytes:
+    """
+    JPEG thumbnail of a generated image, encoded once per (path, mtime).
     
-    /* Status indicators */
-    .status-success {
-        background: #d4edda;
-        color: #155724;
-        padding: 0.5rem 1rem;
-        border-radius: 5px;
-        border-left: 4px solid #2ca02c;
-    }
+    Results are redrawn on every rerun; the full-resolution PNG is only
+    needed for downloads.
     
-    .status-warning {
-        background: #fff3cd;
-        color: #856404;
-        padding: 0.5rem 1rem;
-        border-radius: 5px;
-        border-left: 4px solid #ff7f0e;
-    }
-</style>
-""", unsafe_allow_html=True)
+    Args:
+        path: Image file path
+        mtime: Modification time of the file, invalidating stale entries
+        max_side: Longest side of the thumbnail in pixels
+        
+    Returns:
+        Encoded JPEG bytes
+    """
+    with Image.open(path) as image:
+        image.draft('RGB', (max_side, max_side))
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.convert('RGB').save(buffer, format='JPEG', quality=85)
+    return buffer.getvalue()
 
 
-def render_header():
-    """Render the main header."""
-    st.markdown("""
-    <div class="main-header">
-        <h1>🌍 Global Brand Localizer</h1>
-        <p>AI-Powered Cultural Localization for Global Markets</p>
-    </div>
-    """, unsafe_allow_html=True)
+def thumbnail(path: str) -> bytes:
+    """Cached display thumbnail of an image file on disk."""
+    return load_thumbnail(path, Path(path).stat().st_mtime)
 
 
-def render_sidebar():
-    """Render the sidebar with configuration options."""
-    st.sidebar.markdown("### ⚙️ Configuration")
-    
-    # Region selection
+@st.cache_resource
+def get_region_configs() -> Dict[str, Dict[str, Any]]:
+    """Region configurations, imported once per server process."""
+    from config.region_configs import REGION_CONFIGS
+    return REGION_CONFIGS
+
+
+@st.cache_resource
+def get_localization_agent():
+    """Shared (stateless) localization agent, created once per server process."""
+    from src.localization_agent import LocalizationAgent
+    return LocalizationAgent()
+
+
+@st.cache_resource
+def get_c2pa_verifier():
+    """Shared C2PA verifier; probes for c2patool once per server process."""
+    from src.c2pa_verifier import C2PAVerifier
+    return C2PAVerifier()
+
+
+@st.cache_resource
+def get_available_regions() -> Tuple[str, ...]:
+    """Region IDs offered in the sidebar, resolved once per server process."""
     try:
-        from config.region_configs import REGION_CONFIGS
-        available_regions = list(REGION_CONFIGS.keys())
-    except:
-        available_regions = ["tokyo_subway", "berlin_billboard", "nyc_times_square"]
+        return tuple(get_region_configs())
+    except ImportError:
+        return ("tokyo_subway", "berlin_billboard", "nyc_times_square")
+
+
+@st.cache_resource
+def get_available_samples() -> Dict[str, str]:
+    """
+    Sample images present on disk, checked once per server process.
     
-    selected_regions = st.sidebar.multiselect(
-        "Select Target Regions",
-        options=available_regions,
-        default=available_regions[:3] if len(available_regions) >= 3 else available_regions,
-        help="Choose which regions to generate localized content for"
-    )
+    Streamlit re-executes this script on every rerun, so a module-level
+    check would still stat the files each time; the "Rescan samples" button
+    clears this cache when samples are added while the app runs.
+    """
+    return {name: path for name, path in SAMPLE_IMAGES.items() if Path(path).exists()}
+
+
+def render_header():
+    """
+    Render the custom CSS and the main header.
     
-    # Advanced settings
-    st.sidebar.markdown("### 🔧 Advanced Settings")
+    The header is a static components.html iframe styled by its own
+    stylesheet; its content never changes, so reruns leave it untouched in
+    the browser instead of re-rendering markdown.
+    """
+    st.markdown(f"<style>{load_css('streamlit_app.css')}</style>", unsafe_allow_html=True)
+    components.html(f"<style>{load_css('header.css')}</style>{_HEADER_HTML}", height=HEADER_HEIGHT)
+
+
+def render_sidebar():
+    """
+    Render the sidebar with configuration options.
     
-    consistency_threshold = st.sidebar.slider(
-        "Consistency Threshold (SSIM)",
-        min_value=0.05,
-        max_value=0.30,
-        value=0.15,
-        step=0.01,
-        help="Maximum allowed structural dissimilarity (SSIM-based). Lower = stricter. SSIM is more robust to lighting variations than pixel comparison."
-    )
+    The widgets live in a form, so adjusting several settings costs a single
+    rerun when "Apply settings" is pressed instead of one rerun per change.
+    """
+    st.sidebar.markdown("### ⚙️ Configuration")
     
-    enable_c2pa = st.sidebar.checkbox(
-        "Enable C2PA Verification",
-        value=True,
-        help="Verify content authenticity credentials"
-    )
+    # Region selection
+    available_regions = get_available_regions()
     
-    seed = st.sidebar.number_input(
-        "Random Seed",
-        min_value=1,
-        max_value=999999,
-        value=12345,
-        help="For reproducible results"
-    )
+    with st.sidebar.form("config", clear_on_submit=False):
+        selected_regions = st.multiselect(
+            "Select Target Regions",
+            options=available_regions,
+            default=available_regions[:3] if len(available_regions) >= 3 else available_regions,
+            help="Choose which regions to generate localized content for"
+        )
+        
+        # Advanced settings
+        st.markdown("### 🔧 Advanced Settings")
+        
+        consistency_threshold = st.slider(
+            "Consistency Threshold (SSIM)",
+            min_value=0.05,
+            max_value=0.30,
+            value=0.15,
+            step=0.01,
+            help="Maximum allowed structural dissimilarity (SSIM-based). Lower = stricter. SSIM is more robust to lighting variations than pixel comparison."
+        )
+        
+        enable_c2pa = st.checkbox(
+            "Enable C2PA Verification",
+            value=True,
+            help="Verify content authenticity credentials"
+        )
+        
+        seed = st.number_input(
+            "Random Seed",
+            min_value=1,
+            max_value=999999,
+            value=12345,
+            help="For reproducible results"
+        )
+        
+        st.form_submit_button("Apply settings", use_container_width=True)
     
     return {
         "selected_regions": selected_regions,
@@ -175,13 +379,25 @@ def render_sidebar():
 
 
 def render_image_input():
-    """Render image input section with upload and preexisting options."""
+    """
+    Render image input section with upload and preexisting options.
+    
+    Only image headers are read here; pixels are decoded when the pipeline
+    actually runs.
+    
+    Returns:
+        Absolute path of the selected image, or None
+    """
     st.markdown("### 📸 Product Image Input")
+    st.checkbox(
+        "High-fidelity preview",
+        key="high_fidelity_preview",
+        help="Render previews through st.image instead of a cached inline image"
+    )
     
     # Create tabs for different input methods
     tab1, tab2 = st.tabs(["📤 Upload Image", "🖼️ Use Sample Image"])
     
-    selected_image = None
     image_source = None
     
     with tab1:
@@ -194,34 +410,58 @@ def render_image_input():
         
         if uploaded_file is not None:
             try:
-                selected_image = Image.open(uploaded_file)
-                
-                # FIX: Save uploaded image immediately to persistent location
-                from datetime import datetime
-                upload_dir = Path("output/uploads")
-                upload_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Create unique filename with timestamp
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-                filename = f"uploaded_{timestamp}.png"
-                persistent_path = upload_dir / filename
+                # Decode and save each upload once; later reruns reuse the
+                # session entry keyed by the upload's file_id
+                img_cache = st.session_state.setdefault("img_cache", {})
+                info = img_cache.get(uploaded_file.file_id)
+                if info is None or not Path(info["path"]).exists():
+                    # FIX: Save uploaded image immediately to persistent location
+                    # Name the file by content hash so re-uploading the same
+                    # image reuses the saved copy (and every cache keyed on it)
+                    digest = hashlib.sha1(uploaded_file.getbuffer()).hexdigest()
+                    filename = f"uploaded_{digest}.png"
+                    persistent_path = UPLOAD_DIR / filename
+                    saved_path = str(persistent_path.absolute())  # Use absolute path
+                    
+                    if persistent_path.exists():
+                        info = dict(cached_image_info(saved_path), filename=filename)
+                    else:
+                        # Decode straight from the uploaded buffer and save to
+                        # the persistent location; the decoded image is not kept
+                        uploaded_file.seek(0)
+                        with Image.open(uploaded_file) as uploaded_image:
+                            if uploaded_image.format == 'PNG':
+                                # Already a PNG: keep the uploaded bytes as-is
+                                persistent_path.write_bytes(uploaded_file.getbuffer())
+                            else:
+                                # Fast deflate; the file is only the pipeline's input
+                                uploaded_image.save(
+                                    persistent_path,
+                                    format='PNG',
+                                    compress_level=UPLOAD_PNG_COMPRESS_LEVEL
+                                )
+                            
+                            info = {
+                                "path": saved_path,
+                                "filename": filename,
+                                "width": uploaded_image.size[0],
+                                "height": uploaded_image.size[1],
+                                "mode": uploaded_image.mode
+                            }
+                    img_cache[uploaded_file.file_id] = img_cache[saved_path] = info
                 
-                # Save to persistent location
-                selected_image.save(persistent_path, format='PNG')
-                image_source = str(persistent_path.absolute())  # Use absolute path
+                image_source = info["path"]
                 
                 # Store in session state to prevent loss on rerun
                 st.session_state['uploaded_image_path'] = image_source
                 st.session_state['uploaded_image_name'] = uploaded_file.name
                 
                 # Display uploaded image
-                col1, col2, col3 = st.columns([1, 2, 1])
-                with col2:
-                    st.image(selected_image, caption="Uploaded Image", use_container_width=True)
+                render_preview(image_source, "Uploaded Image")
                 
                 # Image info
-                st.info(f"📊 Image Info: {selected_image.size[0]}×{selected_image.size[1]} pixels, {selected_image.mode} mode")
-                st.success(f"✓ Saved as: {filename}")
+                st.info(f"📊 Image Info: {info['width']}×{info['height']} pixels, {info['mode']} mode")
+                st.success(f"✓ Saved as: {info['filename']}")
                 
             except Exception as e:
                 st.error(f"Error loading image: {e}")
@@ -233,15 +473,13 @@ def render_image_input():
                 # Load from persistent path
                 persistent_path = Path(st.session_state['uploaded_image_path'])
                 if persistent_path.exists():
-                    selected_image = Image.open(persistent_path)
                     image_source = str(persistent_path.absolute())
                     
                     # Display previously uploaded image
-                    col1, col2, col3 = st.columns([1, 2, 1])
-                    with col2:
-                        st.image(selected_image, caption=f"Previously Uploaded: {st.session_state.get('uploaded_image_name', 'Unknown')}", use_container_width=True)
+                    render_preview(image_source, f"Previously Uploaded: {st.session_state.get('uploaded_image_name', 'Unknown')}")
                     
-                    st.info(f"📊 Image Info: {selected_image.size[0]}×{selected_image.size[1]} pixels, {selected_image.mode} mode")
+                    info = cached_image_info(image_source)
+                    st.info(f"📊 Image Info: {info['width']}×{info['height']} pixels, {info['mode']} mode")
                     
                     # Option to clear and upload new
                     if st.button("🗑️ Clear and Upload New", type="secondary"):
@@ -265,15 +503,7 @@ def render_image_input():
         st.markdown("Select from sample product images:")
         
         # Check for sample images
-        sample_images = {
-            "Luxury Wristwatch": "images/wristwatch.png",
-            "Premium Headphones": "images/headphones.png"
-        }
-        
-        available_samples = {}
-        for name, path in sample_images.items():
-            if Path(path).exists():
-                available_samples[name] = path
+        available_samples = get_available_samples()
         
         if available_samples:
             selected_sample = st.selectbox(
@@ -284,22 +514,24 @@ def render_image_input():
             if selected_sample != "None":
                 try:
                     sample_path = available_samples[selected_sample]
-                    selected_image = Image.open(sample_path)
                     image_source = str(Path(sample_path).absolute())  # Use absolute path
                     
                     # Display sample image
-                    col1, col2, col3 = st.columns([1, 2, 1])
-                    with col2:
-                        st.image(selected_image, caption=f"Sample: {selected_sample}", use_container_width=True)
+                    render_preview(image_source, f"Sample: {selected_sample}")
                     
-                    st.info(f"📊 Image Info: {selected_image.size[0]}×{selected_image.size[1]} pixels, {selected_image.mode} mode")
+                    info = cached_image_info(image_source)
+                    st.info(f"📊 Image Info: {info['width']}×{info['height']} pixels, {info['mode']} mode")
                     
                 except Exception as e:
                     st.error(f"Error loading sample image: {e}")
         else:
             st.warning("No sample images found. Please upload your own image.")
+        
+        if st.button("🔄 Rescan samples", type="secondary"):
+            get_available_samples.clear()
+            st.rerun()
     
-    return selected_image, image_source
+    return image_source
 
 
 def process_pipeline(selected_image, image_source, config):
@@ -314,15 +546,10 @@ def process_pipeline(selected_image, image_source, config):
     Returns:
         Dictionary with results or None on error
     """
-    import tempfile
-    from datetime import datetime
-    
     try:
-        # Import pipeline components
-        from src.pipeline_manager import FiboPipelineManager
-        from src.localization_agent import LocalizationAgent
+        # Imported on first run only; OutputManager pulls in OpenCV and scikit-image
         from src.output_manager import OutputManager
-        from config.region_configs import REGION_CONFIGS
+        region_configs = get_region_configs()
         
         # Create unique campaign directory with timestamp
         campaign_id = f"ui_campaign_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -332,12 +559,13 @@ def process_pipeline(selected_image, image_source, config):
         
         # FIX: Use the image_source directly (already saved persistently in render_image_input)
         image_path = image_source
+        image_key = f"{image_path}:{Path(image_path).stat().st_mtime}"
         
         # Step 1: Generate Master JSON from image
         st.write("**Step 1/4:** 🔍 Analyzing product image...")
         progress_bar = st.progress(0.25)
         
-        pipeline = FiboPipelineManager(use_local=False)  # Use Cloud API
+        pipeline = get_pipeline_manager()
         master_json = pipeline.image_to_json(image_path)
         st.success("✓ Master JSON generated")
         
@@ -345,11 +573,11 @@ def process_pipeline(selected_image, image_source, config):
         st.write("**Step 2/4:** 🌍 Creating regional variations...")
         progress_bar.progress(0.50)
         
-        agent = LocalizationAgent()
+        agent = get_localization_agent()
         region_jsons = {}
         
         for region_id in config['selected_regions']:
-            region_config = REGION_CONFIGS[region_id]
+            region_config = region_configs[region_id]
             region_json = agent.merge_configs(master_json, region_config)
             region_jsons[region_id] = region_json
         
@@ -359,25 +587,60 @@ def process_pipeline(selected_image, image_source, config):
         st.write("**Step 3/4:** 🎨 Generating localized images...")
         progress_bar.progress(0.75)
         
+        # Repeated clicks with the same image, region and settings reuse this
+        # session's earlier results instead of another FIBO API round trip.
+        # Only the saved (lossless) 8-bit PNG path is remembered, not the
+        # decoded image. The region JSON is not part of the key: it carries a
+        # per-merge timestamp and is fully determined by the image and region.
+        generation_cache = st.session_state.setdefault('generation_cache', {})
+        num_inference_steps = 30  # Faster generation
+        guidance_scale = 5.0
+        
+        cache_keys = {
+            region_id: (image_key, region_id, config['seed'], num_inference_steps, guidance_scale)
+            for region_id in region_jsons
+        }
         generated_images = {}
-        for i, (region_id, region_json) in enumerate(region_jsons.items()):
-            try:
-                st.write(f"  Generating {region_id}... ({i+1}/{len(region_jsons)})")
-                
-                # Generate image using FIBO pipeline
-                gen_image = pipeline.generate_image(
-                    json_params=region_json,
-                    seed=config['seed'],
-                    num_inference_steps=30,  # Faster generation
-                    guidance_scale=5.0
-                )
-                
-                generated_images[region_id] = gen_image
-                st.write(f"  ✓ {region_id} complete")
+        pending = []
+        for region_id, cache_key in cache_keys.items():
+            cached_path = generation_cache.get(cache_key)
+            if cached_path and Path(cached_path).exists():
+                with Image.open(cached_path) as cached_image:
+                    cached_image.load()
+                    generated_images[region_id] = cached_image.copy()
+                st.write(f"  ✓ {region_id} reused from this session")
+            else:
+                pending.append(region_id)
+        
+        # Each region is a blocking FIBO API request, so run them concurrently;
+        # progress is reported from this thread as requests complete
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(GENERATION_WORKERS, len(pending))) as executor:
+                futures = {
+                    executor.submit(
+                        pipeline.generate_image,
+                        json_params=region_jsons[region_id],
+                        seed=config['seed'],
+                        num_inference_steps=num_inference_steps,
+                        guidance_scale=guidance_scale
+                    ): region_id
+                    for region_id in pending
+                }
                 
-            except Exception as e:
-                st.warning(f"  ⚠ Failed to generate {region_id}: {e}")
-                logger.error(f"Generation failed for {region_id}: {e}")
+                for done, future in enumerate(as_completed(futures), start=1):
+                    region_id = futures[future]
+                    try:
+                        generated_images[region_id] = future.result()
+                        st.write(f"  ✓ {region_id} complete ({done}/{len(pending)})")
+                    except Exception as e:
+                        st.warning(f"  ⚠ Failed to generate {region_id}: {e}")
+                        logger.error(f"Generation failed for {region_id}: {e}")
+        
+        # Restore region order for saving and display
+        generated_images = {
+            region_id: generated_images[region_id]
+            for region_id in region_jsons if region_id in generated_images
+        }
         
         if not generated_images:
             raise RuntimeError("No images were generated successfully")
@@ -401,15 +664,36 @@ def process_pipeline(selected_image, image_source, config):
             'master_image_path': image_path
         }
         
-        for region_id, gen_image in generated_images.items():
-            result = output_manager.save_dual_output(
-                image=gen_image,
-                region_json=region_jsons[region_id],
-                region_id=region_id,
-                seed=config['seed'],
-                master_image=selected_image
-            )
-            results['regions'][region_id] = result
+        # Regions are written to separate directories, so save them concurrently
+        with ThreadPoolExecutor(max_workers=min(GENERATION_WORKERS, len(generated_images))) as executor:
+            saves = {
+                region_id: executor.submit(
+                    output_manager.save_dual_output,
+                    image=gen_image,
+                    region_json=region_jsons[region_id],
+                    region_id=region_id,
+                    seed=config['seed'],
+                    master_image=selected_image
+                )
+                for region_id, gen_image in generated_images.items()
+            }
+            for region_id, future in saves.items():
+                result = future.result()
+                # Check once which outputs were written; the result views
+                # read these flags on every rerun instead of stat-ing files
+                result['assets_present'] = {
+                    kind: bool(result.get(f'{kind}_path')) and Path(result[f'{kind}_path']).exists()
+                    for kind in ASSET_KINDS
+                }
+                results['regions'][region_id] = result
+                if result['assets_present']['png']:
+                    # Re-insert so the most recently used entries are evicted last
+                    generation_cache.pop(cache_keys[region_id], None)
+                    generation_cache[cache_keys[region_id]] = result['png_path']
+        
+        # Keep the session cache bounded (oldest entries first)
+        while len(generation_cache) > GENERATION_CACHE_SIZE:
+            generation_cache.pop(next(iter(generation_cache)))
         
         st.success("✓ All outputs saved successfully!")
         
@@ -429,12 +713,14 @@ def render_tab_generate(config):
     
     with col1:
         # Image input section
-        selected_image, image_source = render_image_input()
+        image_source = render_image_input()
         
         # Process button
-        if selected_image is not None and config['selected_regions']:
+        if image_source is not None and config['selected_regions']:
             if st.button("🚀 Generate Localized Content", type="primary", use_container_width=True):
                 with st.spinner("Processing..."):
+                    # Pixels are only needed once the pipeline runs
+                    selected_image = load_image_file(image_source, Path(image_source).stat().st_mtime)
                     results = process_pipeline(selected_image, image_source, config)
                 
                 if results:
@@ -442,7 +728,7 @@ def render_tab_generate(config):
                     st.session_state['show_results_prompt'] = True
                     st.rerun()
         else:
-            if selected_image is None:
+            if image_source is None:
                 st.info("👆 Please select or upload an image to get started.")
             elif not config['selected_regions']:
                 st.info("👈 Please select at least one target region in the sidebar.")
@@ -452,32 +738,21 @@ def render_tab_generate(config):
             st.balloons()  # Celebration effect!
             st.success("🎉 Processing complete!")
             results = st.session_state.get('results', {})
-            st.info(f"📁 Results saved to: {results.get('output_dir', 'output/')}")
-            st.info("👉 **Click the 'Results Gallery' tab above** to view your images!")
+            st.info(
+                f"📁 Results saved to: {results.get('output_dir', 'output/')}  \n"
+                "👉 **Click the 'Results Gallery' tab above** to view your images!"
+            )
             
             if st.button("✅ Got it!", type="primary", use_container_width=True):
                 st.session_state['show_results_prompt'] = False
                 st.rerun()
     
     with col2:
-        # Instructions
-        st.markdown("#### 🎯 Quick Start Guide")
-        st.markdown("""
-        1. **Upload/Select** product image
-        2. **Choose regions** in sidebar
-        3. **Generate** localized content
-        4. **View results** in Gallery tab
-        """)
-        
-        st.markdown("---")
-        st.markdown("#### ✨ Key Features")
-        st.markdown("""
-        - **🎨 Background Replacement** - Perfect product consistency
-        - **📊 SSIM Verification** - Industry-standard metrics
-        - **🔒 C2PA Ready** - Content credentials
-        - **📁 Dual Output** - TIFF (print) + PNG (web)
-        - **📋 JSON Audit Trail** - Complete documentation
-        """)
+        # Instructions, shown in full until an image is selected
+        if image_source is None:
+            st.markdown(_QUICK_START_MD)
+        else:
+            st.caption("🎯 Choose regions in the sidebar, then generate and view results in the Gallery tab.")
 
 
 def render_tab_results(config):
@@ -525,10 +800,8 @@ def render_tab_results(config):
                 
                 with col:
                     # Display thumbnail
-                    if region_result.get('png_path') and Path(region_result['png_path']).exists():
-                        from PIL import Image
-                        img = Image.open(region_result['png_path'])
-                        st.image(img, use_container_width=True)
+                    if region_result['assets_present']['png']:
+                        st.image(thumbnail(region_result['png_path']), use_container_width=True)
                     
                     # Region name and select button
                     region_name = region_id.replace('_', ' ').title()
@@ -562,38 +835,32 @@ def render_tab_results(config):
         
         with col_img:
             # Full size image
-            if region_result.get('png_path') and Path(region_result['png_path']).exists():
-                from PIL import Image
-                img = Image.open(region_result['png_path'])
-                st.image(img, caption=f"{selected_region.replace('_', ' ').title()}", use_container_width=True)
+            if region_result['assets_present']['png']:
+                st.image(thumbnail(region_result['png_path']), caption=f"{selected_region.replace('_', ' ').title()}", use_container_width=True)
         
         with col_info:
             st.markdown("**📥 Downloads:**")
             
             # Download 16-bit TIFF
-            if region_result.get('tiff_path') and Path(region_result['tiff_path']).exists():
-                with open(region_result['tiff_path'], 'rb') as f:
-                    st.download_button(
-                        label="📄 16-bit TIFF (Print)",
-                        data=f.read(),
-                        file_name=Path(region_result['tiff_path']).name,
-                        mime="image/tiff",
-                        key=f"tiff_{selected_region}"
-                    )
+            if region_result['assets_present']['tiff']:
+                file_download_button(
+                    label="📄 16-bit TIFF (Print)",
+                    path=region_result['tiff_path'],
+                    mime="image/tiff",
+                    key=f"tiff_{selected_region}"
+                )
             
             # Download 8-bit PNG
-            if region_result.get('png_path') and Path(region_result['png_path']).exists():
-                with open(region_result['png_path'], 'rb') as f:
-                    st.download_button(
-                        label="🖼️ 8-bit PNG (Web)",
-                        data=f.read(),
-                        file_name=Path(region_result['png_path']).name,
-                        mime="image/png",
-                        key=f"png_{selected_region}"
-                    )
+            if region_result['assets_present']['png']:
+                file_download_button(
+                    label="🖼️ 8-bit PNG (Web)",
+                    path=region_result['png_path'],
+                    mime="image/png",
+                    key=f"png_{selected_region}"
+                )
             
             # Download JSON
-            if region_result.get('json_path') and Path(region_result['json_path']).exists():
+            if region_result['assets_present']['json']:
                 with open(region_result['json_path'], 'r') as f:
                     st.download_button(
                         label="📋 JSON Parameters",
@@ -631,12 +898,10 @@ def render_tab_results(config):
                 st.warning("⚠️ Flagged for Review")
         
         # Display heatmap if available
-        if region_result.get('heatmap_path') and Path(region_result['heatmap_path']).exists():
+        if region_result['assets_present']['heatmap']:
             st.markdown("---")
             st.markdown("**🔍 Consistency Heatmap:**")
-            from PIL import Image
-            heatmap_img = Image.open(region_result['heatmap_path'])
-            st.image(heatmap_img, caption="Product Consistency Heatmap", use_container_width=True)
+            st.image(thumbnail(region_result['heatmap_path']), caption="Product Consistency Heatmap", use_container_width=True)
             st.caption("Red areas = differences, Blue areas = identical")
     else:
         st.info("👆 Click on any image above to view detailed information")
@@ -694,10 +959,8 @@ def render_tab_creative_studio(config):
                 
                 with col:
                     # Display thumbnail
-                    if region_result.get('png_path') and Path(region_result['png_path']).exists():
-                        from PIL import Image
-                        img = Image.open(region_result['png_path'])
-                        st.image(img, use_container_width=True)
+                    if region_result['assets_present']['png']:
+                        st.image(thumbnail(region_result['png_path']), use_container_width=True)
                     
                     # Region name
                     region_name = region_id.replace('_', ' ').title()
@@ -761,14 +1024,11 @@ def render_tab_creative_studio(config):
             with st.spinner("Generating creative variation with FIBO..."):
                 try:
                     # Load the JSON parameters for this region
-                    import json
                     with open(region_result['json_path'], 'r') as f:
                         region_json = json.load(f)
                     
                     # Use FIBO generation
-                    from src.pipeline_manager import FiboPipelineManager
-                    
-                    pipeline = FiboPipelineManager(use_local=False)
+                    pipeline = get_pipeline_manager()
                     
                     # Generate using FIBO with user parameters
                     fibo_image, image_url = pipeline._generate_image_fibo(
@@ -783,8 +1043,7 @@ def render_tab_creative_studio(config):
                     pipeline.api_manager.download_image(image_url, output_path=variation_path)
                     
                     # Verify C2PA
-                    from src.c2pa_verifier import C2PAVerifier
-                    c2pa_verifier = C2PAVerifier()
+                    c2pa_verifier = get_c2pa_verifier()
                     is_verified, c2pa_metadata = c2pa_verifier.verify_image(Path(variation_path))
                     
                     # Store in session state (as a list for multiple variations)
@@ -843,25 +1102,21 @@ def render_tab_creative_studio(config):
                                     st.caption("ℹ️ C2PA: Check manually")
                                 
                                 # Download button
-                                with open(var_data['path'], 'rb') as f:
-                                    st.download_button(
-                                        label="📥 Download",
-                                        data=f.read(),
-                                        file_name=Path(var_data['path']).name,
-                                        mime="image/png",
-                                        key=f"download_var_{i+j}_{var_data['seed']}",
-                                        use_container_width=True
-                                    )
+                                file_download_button(
+                                    label="📥 Download",
+                                    path=var_data['path'],
+                                    mime="image/png",
+                                    key=f"download_var_{i+j}_{var_data['seed']}",
+                                    use_container_width=True
+                                )
         
         # Original comparison
         st.markdown("---")
         st.markdown("### 📍 Original (Background Replacement)")
-        if region_result.get('png_path') and Path(region_result['png_path']).exists():
-            from PIL import Image
-            img = Image.open(region_result['png_path'])
+        if region_result['assets_present']['png']:
             col_orig, col_info = st.columns([2, 1])
             with col_orig:
-                st.image(img, caption=f"Original: {selected_region.replace('_', ' ').title()}", use_container_width=True)
+                st.image(thumbnail(region_result['png_path']), caption=f"Original: {selected_region.replace('_', ' ').title()}", use_container_width=True)
             with col_info:
                 st.info("✅ Perfect product consistency (SSIM ~0.001)")
                 st.caption("Uses Background Replacement API - No C2PA")
@@ -922,8 +1177,7 @@ def render_tab_audit(config):
         region_result = results['regions'][selected_region]
         
         # Load JSON data
-        if region_result.get('json_path') and Path(region_result['json_path']).exists():
-            import json
+        if region_result['assets_present']['json']:
             with open(region_result['json_path'], 'r') as f:
                 json_data = json.load(f)
             
@@ -1059,11 +1313,7 @@ def main():
     
     # Footer - more compact
     st.markdown("---")
-    st.markdown("""
-    <div style="text-align: center; color: #999; padding: 0.5rem; font-size: 0.85rem;">
-        🌍 Global Brand Localizer | Powered by Bria AI
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,52 @@
+"""
+Streamlit helpers shared by the Global Brand Localizer UIs
+"""
+
+import streamlit as st
+from pathlib import Path
+from typing import Optional, Union
+
+
+@st.cache_resource
+def load_css(filename: str) -> str:
+    """Read a stylesheet from src/ui/styles once per server process."""
+    return (Path(__file__).parent / "styles" / filename).read_text(encoding="utf-8")
+
+
+def file_download_button(
+    label: str,
+    path: Union[str, Path],
+    mime: str,
+    key: Optional[str] = None,
+    **kwargs
+):
+    """
+    Download button that reads the file only once the user asks for it.
+    
+    st.download_button needs the file contents up front, so rendering it
+    directly would load every large TIFF on each rerun. A plain button
+    stands in until clicked; after that the real download button is
+    rendered for this file until the download has been served.
+    
+    Args:
+        label: Button label
+        path: File to offer for download
+        mime: MIME type of the file
+        key: Widget key prefix, unique per button (defaults to one derived from path)
+        **kwargs: Extra arguments for both buttons (e.g. use_container_width)
+    """
+    path = Path(path)
+    key = key or f"download_{path}"
+    ready_key = f"download_ready_{key}"
+    if st.session_state.get(ready_key) or st.button(label, key=f"prepare_{key}", **kwargs):
+        st.session_state[ready_key] = True
+        st.download_button(
+            label=label,
+            data=path.read_bytes(),
+            file_name=path.name,
+            mime=mime,
+            key=key,
+            on_click=st.session_state.pop,
+            args=(ready_key, None),
+            **kwargs
+        )
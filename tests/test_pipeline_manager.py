@@ -2,11 +2,30 @@
 Unit tests for FIBO Pipeline Manager
 """
 
+import threading
+import time
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from src import pipeline_manager
 from src.pipeline_manager import FiboPipelineManager, create_pipeline_manager
 
 
+def fake_vlm(calls):
+    """Stand-in image → JSON backend that records each call."""
+    def image_to_json(image_path, prompt, image):
+        calls.append(image_path)
+        return {
+            "version": "1.0",
+            "metadata": {"campaign_id": f"campaign_{len(calls)}", "created_at": "then"},
+            "locked_parameters": {},
+            "variable_parameters": {}
+        }
+    return image_to_json
+
+
 class TestPipelineManager:
     """Test suite for FiboPipelineManager"""
     
@@ -39,6 +58,15 @@ class TestPipelineManager:
         assert isinstance(status['vlm_pipeline_loaded'], bool)
         assert isinstance(status['fibo_pipeline_loaded'], bool)
     
+    def test_get_status_does_not_import_torch_in_cloud_mode(self, monkeypatch):
+        """Test the status poll reports no CUDA without probing torch in Cloud API mode"""
+        fake_torch = MagicMock()
+        monkeypatch.setattr(pipeline_manager, "torch", fake_torch)
+        manager = FiboPipelineManager(use_local=False)
+        
+        assert manager.get_status()["cuda_available"] is False
+        fake_torch.cuda.is_available.assert_not_called()
+    
     def test_create_pipeline_manager_convenience(self):
         """Test convenience function"""
         manager = create_pipeline_manager(use_local=False)
@@ -86,6 +114,185 @@ class TestPipelineManager:
             assert isinstance(geometry['scale'], (int, float))
             assert isinstance(geometry['rotation'], (int, float))
 
+    
+    def test_vlm_cache_hit_gets_fresh_campaign(self, tmp_path):
+        """Test a VLM cache hit reuses parameters but not campaign metadata"""
+        manager = FiboPipelineManager(use_local=False, vlm_cache_dir=tmp_path)
+        calls = []
+        manager._image_to_json_impl = fake_vlm(calls)
+        image_path = Path("images/wristwatch.png")
+        
+        first = manager.image_to_json(image_path)
+        second = manager.image_to_json(image_path)
+        
+        assert len(calls) == 1
+        assert second["locked_parameters"] == first["locked_parameters"]
+        assert second["metadata"]["campaign_id"] != first["metadata"]["campaign_id"]
+        assert second["metadata"]["created_at"] != "then"
+        
+        # A new process reads the persisted entry and also gets fresh metadata
+        other = FiboPipelineManager(use_local=False, vlm_cache_dir=tmp_path)
+        other._image_to_json_impl = fake_vlm(calls)
+        third = other.image_to_json(image_path)
+        
+        assert len(calls) == 1
+        assert third["metadata"]["campaign_id"] not in (
+            first["metadata"]["campaign_id"], second["metadata"]["campaign_id"]
+        )
+    
+    def test_vlm_cache_key_tracks_version_and_opt_out(self, tmp_path, monkeypatch):
+        """Test cache entries are versioned and the cache can be turned off"""
+        manager = FiboPipelineManager(use_local=False, vlm_cache_dir=tmp_path)
+        image_path = Path("images/wristwatch.png")
+        
+        key = manager._vlm_cache_key(image_path, None)
+        monkeypatch.setattr(pipeline_manager, "VLM_CACHE_VERSION", pipeline_manager.VLM_CACHE_VERSION + 1)
+        assert manager._vlm_cache_key(image_path, None) != key
+        
+        disabled = FiboPipelineManager(use_local=False, vlm_cache=False, vlm_cache_dir=tmp_path)
+        calls = []
+        disabled._image_to_json_impl = fake_vlm(calls)
+        disabled.image_to_json(image_path)
+        disabled.image_to_json(image_path)
+        
+        assert len(calls) == 2
+        assert not any(tmp_path.iterdir())
+    
+    @pytest.mark.parametrize("quantization", [None, "int8"])
+    def test_configure_fibo_channels_last_with_quantization(self, monkeypatch, quantization):
+        """Test UNet/VAE go channels_last on CUDA whether or not quantization is on"""
+        fake_torch = MagicMock()
+        monkeypatch.setattr(pipeline_manager, "torch", fake_torch)
+        manager = FiboPipelineManager(use_local=False, quantization=quantization)
+        manager.device = 'cuda'
+        for method in ('_sdpa_available', '_quantize_transformer', '_enable_transformer_cache',
+                       '_compile_transformer', '_warmup_pipeline'):
+            monkeypatch.setattr(manager, method, MagicMock(return_value=True))
+        pipeline = SimpleNamespace(unet=MagicMock(), vae=MagicMock(), transformer=MagicMock())
+        
+        manager._configure_fibo_pipeline(pipeline)
+        
+        pipeline.unet.to.assert_called_once_with(memory_format=fake_torch.channels_last)
+        pipeline.vae.to.assert_called_once_with(memory_format=fake_torch.channels_last)
+        pipeline.transformer.to.assert_not_called()
+        assert manager._quantize_transformer.called == (quantization is not None)
+        # Warmup only runs from preload_pipelines, not on a lazy load
+        manager._warmup_pipeline.assert_not_called()
+    
+    def test_configure_fibo_cpu_keeps_memory_format(self, monkeypatch):
+        """Test channels_last is only applied on CUDA"""
+        monkeypatch.setattr(pipeline_manager, "torch", MagicMock())
+        manager = FiboPipelineManager(use_local=False, quantization="int8")
+        monkeypatch.setattr(manager, '_quantize_transformer', MagicMock())
+        monkeypatch.setattr(manager, '_enable_transformer_cache', MagicMock())
+        pipeline = SimpleNamespace(unet=MagicMock(), vae=MagicMock(), transformer=MagicMock())
+        
+        manager._configure_fibo_pipeline(pipeline)
+        
+        pipeline.vae.to.assert_not_called()
+        manager._quantize_transformer.assert_called_once_with(pipeline)
+
+    
+    def test_lazy_pipeline_load_is_shared_across_threads(self):
+        """Test concurrent first accesses wait for a single pipeline load"""
+        manager = FiboPipelineManager(use_local=False)
+        loads = []
+        started = threading.Event()
+        
+        def slow_loader():
+            loads.append(1)
+            started.set()
+            time.sleep(0.2)
+            return "fibo"
+        
+        manager._fibo_loader = slow_loader
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(lambda: manager.fibo_pipeline)
+            started.wait()
+            others = [executor.submit(lambda: manager.fibo_pipeline) for _ in range(3)]
+            results = [first.result()] + [future.result() for future in others]
+        
+        assert results == ["fibo"] * 4
+        assert len(loads) == 1
+
+    
+    def test_vlm_offloads_once_per_outermost_use(self, monkeypatch):
+        """Test nested VLM uses (batch run, per-image fallback) share one residency"""
+        manager = FiboPipelineManager(use_local=False)
+        moves = []
+        monkeypatch.setattr(manager, '_move_vlm', moves.append)
+        
+        with manager._vlm_on_device():
+            with manager._vlm_on_device():
+                pass
+            with manager._vlm_on_device():
+                pass
+        
+        assert moves == [manager.device, 'cpu']
+
+    
+    def test_vlm_batch_uses_pipeline_wrapper(self):
+        """Test batched VLM runs go through the pipeline wrapper with RGB images"""
+        manager = FiboPipelineManager(use_local=False)
+        calls = []
+        
+        def fake_pipeline(images, **kwargs):
+            calls.append((images, kwargs))
+            if isinstance(images, list):
+                return [[{"generated_text": "{}"}] for _ in images]
+            return [{"generated_text": "{}"}]
+        
+        manager.vlm_pipeline = fake_pipeline
+        image_path = Path("images/wristwatch.png")
+        prefetched = [image for _, image in manager.iter_prefetched_images([image_path, image_path])]
+        
+        outputs = manager._run_vlm_batch([image_path, image_path], [prefetched[0], None])
+        single = manager._run_vlm(image_path)
+        
+        assert len(outputs) == 2
+        assert single == [{"generated_text": "{}"}]
+        batch_images, batch_kwargs = calls[0]
+        assert batch_kwargs == {"batch_size": 2}
+        assert batch_images[0] is prefetched[0]
+        assert all(image.mode == "RGB" for image in batch_images)
+        assert calls[1][0].mode == "RGB" and calls[1][1] == {}
+
+    
+    def test_transformer_cache_is_opt_in(self):
+        """Test lossy transformer caching only runs when a cache_config is given"""
+        pipeline = SimpleNamespace(transformer=MagicMock())
+        
+        FiboPipelineManager(use_local=False)._enable_transformer_cache(pipeline)
+        pipeline.transformer.enable_cache.assert_not_called()
+        
+        config = SimpleNamespace()
+        FiboPipelineManager(use_local=False, cache_config=config)._enable_transformer_cache(pipeline)
+        pipeline.transformer.enable_cache.assert_called_once_with(config)
+
+    
+    def test_warmup_flag_preloads_local_pipelines(self, monkeypatch):
+        """Test warmup=True loads the local pipelines and warms up FIBO at init"""
+        fake_fibo = MagicMock()
+        
+        def fake_initialize(manager):
+            manager._vlm_loader = MagicMock(return_value=MagicMock())
+            manager._fibo_loader = MagicMock(return_value=fake_fibo)
+        
+        monkeypatch.setattr(FiboPipelineManager, '_initialize_local_pipelines', fake_initialize)
+        warmups = []
+        monkeypatch.setattr(FiboPipelineManager, '_warmup_pipeline', lambda manager, pipeline: warmups.append(pipeline))
+        
+        manager = FiboPipelineManager(use_local=True, device='cuda', warmup=True)
+        
+        assert manager._fibo_pipeline is fake_fibo
+        assert manager._vlm_pipeline is not None
+        assert warmups == [fake_fibo]
+        
+        lazy = FiboPipelineManager(use_local=True, device='cuda')
+        
+        assert lazy._fibo_pipeline is None
+        assert warmups == [fake_fibo]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
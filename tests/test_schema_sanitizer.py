@@ -0,0 +1,100 @@
+"""
+Unit tests for Schema Sanitizer partial matching
+"""
+
+import pytest
+from src import schema_sanitizer
+from src.schema_sanitizer import SchemaSanitizer
+
+
+def build_sanitizer(monkeypatch, use_automaton: bool) -> SchemaSanitizer:
+    """Build a sanitizer on the Aho-Corasick path or the pure-Python fallback."""
+    monkeypatch.setattr(schema_sanitizer, "AHOCORASICK_AVAILABLE", use_automaton)
+    return SchemaSanitizer()
+
+
+def candidate_values(mappings):
+    """VLM-like values per parameter type: exact, embedded, truncated and unmatched phrases."""
+    for parameter_type, mapping in mappings.items():
+        for key, fibo_value in mapping.items():
+            yield parameter_type, key
+            yield parameter_type, fibo_value
+            yield parameter_type, f"  {key.upper()}  "
+            yield parameter_type, f"a {key} shot with warm tones"
+            yield parameter_type, f"{key} and {key}"
+            if len(key) > 3:
+                yield parameter_type, key[1:-1]
+        yield parameter_type, "something entirely unrelated"
+        yield parameter_type, ""
+
+
+requires_automaton = pytest.mark.skipif(
+    not schema_sanitizer.AHOCORASICK_AVAILABLE,
+    reason="pyahocorasick not installed"
+)
+
+
+class TestSchemaSanitizer:
+    """Test suite for SchemaSanitizer matching engines"""
+    
+    @requires_automaton
+    def test_automaton_matches_fallback_per_value(self, monkeypatch):
+        """Test the automaton and the fallback loop map every value identically"""
+        automaton = build_sanitizer(monkeypatch, use_automaton=True)
+        fallback = build_sanitizer(monkeypatch, use_automaton=False)
+        
+        assert automaton._matchers and not automaton._partial_keys
+        assert fallback._partial_keys and not fallback._matchers
+        
+        for parameter_type, value in candidate_values(fallback.mappings):
+            assert automaton._sanitize_value(value, parameter_type) == \
+                fallback._sanitize_value(value, parameter_type), (parameter_type, value)
+    
+    @requires_automaton
+    def test_automaton_matches_fallback_full_prompt(self, monkeypatch):
+        """Test both engines produce the same sanitized structured prompt"""
+        automaton = build_sanitizer(monkeypatch, use_automaton=True)
+        fallback = build_sanitizer(monkeypatch, use_automaton=False)
+        
+        prompt = {
+            "photographic_characteristics": {
+                "camera_angle": "slightly low angle view",
+                "lens_focal_length": "portrait lens"
+            },
+            "lighting": {"conditions": "soft natural window light"},
+            "style_medium": "high-end product photo",
+            "background_setting": "marble countertop"
+        }
+        
+        assert automaton.sanitize(prompt) == fallback.sanitize(prompt)
+    
+    def test_fallback_prefers_longest_key(self, monkeypatch):
+        """Test partial matching resolves to the most specific phrase"""
+        sanitizer = build_sanitizer(monkeypatch, use_automaton=False)
+        
+        assert sanitizer._sanitize_value("an oil painting style", "style_medium") == "oil_painting"
+        assert sanitizer._sanitize_value("unmatched phrase", "style_medium") == "unmatched phrase"
+    
+    def test_focal_length_keeps_table_priority(self):
+        """Test several lens descriptions resolve in mapping-table order, not position"""
+        sanitizer = SchemaSanitizer()
+        
+        assert sanitizer._sanitize_focal_length("telephoto or wide") == "24mm"
+        assert sanitizer._sanitize_focal_length("portrait, standard lens") == "50mm"
+        assert sanitizer._sanitize_focal_length("wide angle macro") == "macro"
+        assert sanitizer._sanitize_focal_length("85mm portrait") == "85mm portrait"
+        assert sanitizer._sanitize_focal_length("fisheye") == "fisheye"
+    
+    def test_sanitize_does_not_mutate_input(self, monkeypatch):
+        """Test a caller's dict is left untouched"""
+        sanitizer = build_sanitizer(monkeypatch, use_automaton=schema_sanitizer.AHOCORASICK_AVAILABLE)
+        prompt = {"lighting": {"conditions": "studio"}}
+        
+        result = sanitizer.sanitize(prompt)
+        
+        assert result["lighting"]["conditions"] == "studio_lighting"
+        assert prompt == {"lighting": {"conditions": "studio"}}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])